@@ -0,0 +1,6 @@
+from .cases import CASES
+from .runner import measure
+from .runner import scratch
+from .runner import run
+from .runner import compare
+from .runner import plot
\ No newline at end of file
@@ -0,0 +1,45 @@
+import argparse
+import json
+import sys
+from benchmarks.cases import CASES
+from benchmarks.runner import run, compare, plot, scratch
+
+parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks the mathalgs entry points.")
+parser.add_argument("cases", nargs="*", help="cases to run, all by default")
+parser.add_argument("--repeat", type=int, default=3, help="timed calls per measurement")
+parser.add_argument("--max-size", type=int, help="largest problem size to run")
+parser.add_argument("--max-queries", type=int, help="largest query size to run")
+parser.add_argument("--output", help="save the results as JSON")
+parser.add_argument("--baseline", help="compare against results saved as JSON")
+parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative increase over the baseline")
+parser.add_argument("--plot", help="save the scaling curves as an image")
+parser.add_argument("--scratch", action="store_true", help="only check the scratch memory of evaluations into out=")
+arguments = parser.parse_args()
+
+if arguments.scratch:
+    failures = scratch(log=print)
+    for name, points, buffers in failures:
+        print(f"Scratch memory: {name} points={points} {buffers:.2f} buffers")
+    sys.exit(1 if failures else 0)
+
+for name in arguments.cases:
+    if name not in CASES:
+        parser.error(f"unknown case {name}, choose from {', '.join(CASES)}")
+
+results = run(arguments.cases, arguments.repeat, arguments.max_size, arguments.max_queries, log=print)
+
+if arguments.output:
+    with open(arguments.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+if arguments.plot:
+    plot(results, arguments.plot)
+
+if arguments.baseline:
+    with open(arguments.baseline) as file:
+        regressions = compare(results, json.load(file), arguments.threshold)
+
+    for name, size, metric, ratio in regressions:
+        print(f"Regression: {name} n={size} {metric} x{ratio:.2f}")
+    if regressions:
+        sys.exit(1)
\ No newline at end of file
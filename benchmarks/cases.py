@@ -0,0 +1,121 @@
+import numpy as np
+import mathalgs as ma
+
+def grid(size, slices=1, seed=0):
+    """
+    Generates synthetic data shaped like `data.txt`: evenly spaced x values on [-10, 10]
+    and a noisy cubic `f(x,y)` for every one of `slices` evenly spaced y values.
+
+    :param size: Number of x values.
+    :param slices: Number of y values.
+    :param seed: Seed of the noise.
+    :return: A tuple of the x values, the y values and an array of shape `(slices, size)`.
+    """
+    rng = np.random.default_rng(seed)
+    xs = np.linspace(-10, 10, size)
+    ys = np.linspace(-10, 10, slices)
+    zs = 8 * xs ** 3 - 15 * ys[:, None] * xs ** 2 + 40 * ys[:, None] + rng.normal(0, 50, (slices, size))
+
+    return xs, ys, zs
+
+def _statistics(function):
+    def setup(size):
+        _, _, zs = grid(size)
+        return lambda: function(zs[0])
+    return setup
+
+def _polynomial_interpolation(size, count):
+    xs, _, zs = grid(size)
+    queries = np.linspace(-10, 10, count)
+    return lambda: ma.interpolate.polynomial(xs, zs[0], queries)
+
+def _spline_interpolation(size, count):
+    xs, _, zs = grid(size)
+    queries = np.linspace(-10, 10, count)
+    return lambda: ma.interpolate.spline(xs, zs[0], queries)
+
+def _parallel_spline_evaluation(size, count):
+    xs, _, zs = grid(size)
+    interpolant = ma.interpolate.SplineInterpolant(xs, zs[0])
+    queries = np.linspace(-10, 10, count)
+    return lambda: ma.parallel.evaluate(interpolant, queries)
+
+def _adaptive_sampling(size):
+    xs, _, zs = grid(60, slices=size)
+    interpolant = ma.interpolate.SplineInterpolant(xs, zs)
+    return lambda: ma.sampling.adaptive(interpolant, -10, 10, tolerance=10)
+
+def _polynomial_approximation(size, count):
+    xs, _, zs = grid(size)
+    queries = np.linspace(-13, 13, count)
+    return lambda: ma.approximate.polynomial(xs, zs[0], 3, queries)
+
+def _integration(size):
+    xs, _, zs = grid(size)
+    return lambda: ma.integrate.trapezoidal(xs, zs[0])
+
+def _differentiation(size):
+    xs, _, zs = grid(size)
+    return lambda: ma.differentiation.differentiate(xs, zs[0])
+
+def _monotonicity(size):
+    xs, _, zs = grid(size)
+    return lambda: ma.differentiation.monotonicity(xs, zs[0])
+
+CASES = {
+    "statistics.average": (_statistics(ma.statistics.average), [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], None),
+    "statistics.median": (_statistics(ma.statistics.median), [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], None),
+    "statistics.deviation": (_statistics(ma.statistics.deviation), [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], None),
+    "interpolate.polynomial": (_polynomial_interpolation, [10, 20, 40, 80], [10 ** 3, 10 ** 4, 10 ** 5]),
+    "interpolate.spline": (_spline_interpolation, [30, 300, 3000, 30000], [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]),
+    "parallel.evaluate": (_parallel_spline_evaluation, [3000, 30000], [10 ** 4, 10 ** 5, 10 ** 6]),
+    "sampling.adaptive": (_adaptive_sampling, [10, 100, 1000], None),
+    "approximate.polynomial": (_polynomial_approximation, [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]),
+    "integrate.trapezoidal": (_integration, [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], None),
+    "differentiation.differentiate": (_differentiation, [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], None),
+    "differentiation.monotonicity": (_monotonicity, [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6], None),
+}
+"""
+Benchmarked entry points, mapping their names to a tuple of a setup function, the
+problem sizes and the query sizes. The setup function takes a problem size, and for
+entry points evaluating a fit also a query size, the number of points the fit is
+evaluated at, and returns a callable running the entry point on prepared data, so that
+only the call itself is measured. Entry points without queries have None as query sizes.
+"""
+
+def _evaluation(fit):
+    def setup(points, count):
+        xs, _, zs = grid(points)
+        fitted = fit(xs, zs[0])
+        queries = np.linspace(-10, 10, count)
+        out = np.empty(count)
+        return lambda: fitted(queries, out=out), out
+    return setup
+
+def _polynomial_evaluation(points, count):
+    xs, _, zs = grid(1000)
+    fitted = ma.approximate.PolynomialFit(xs, zs[0], points - 1, basis="chebyshev")
+    queries = np.linspace(-10, 10, count)
+    out = np.empty(count)
+    return lambda: fitted(queries, out=out), out
+
+def _differentiation_into(points, count):
+    xs, _, zs = grid(count)
+    out = np.empty(count)
+    return lambda: ma.differentiation.differentiate(xs, zs[0], accuracy=points - 1, out=out), out
+
+SCRATCH = {
+    "NewtonInterpolant": (_evaluation(ma.interpolate.NewtonInterpolant), [8, 32], 2),
+    "BarycentricInterpolant": (_evaluation(ma.interpolate.BarycentricInterpolant), [8, 32], 6),
+    "SplineInterpolant": (_evaluation(ma.interpolate.SplineInterpolant), [30, 3000], 12),
+    "PolynomialFit": (_polynomial_evaluation, [4, 16], 6),
+    "differentiate": (_differentiation_into, [3, 9], 3),
+}
+"""
+Evaluations into an `out=` array, mapping their names to a tuple of a setup function,
+the numbers of points and the budget of scratch memory. The points are the nodes of the
+fit, the coefficients of the polynomial or the points of the central stencil. The setup
+function takes a number of points and a query size and returns a callable evaluating
+into `out` and the `out` array itself. The scratch memory of an evaluation must not grow
+with the number of points and stays within the budget, given in arrays of the size of `out`.
+"""
\ No newline at end of file
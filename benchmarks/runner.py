@@ -0,0 +1,164 @@
+import platform
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.cases import CASES
+from benchmarks.cases import SCRATCH
+
+def measure(function, repeat=3):
+    """
+    Measures the wall time and the peak memory of a callable. The time is the best of
+    `repeat` calls, the peak memory is traced during one additional call and includes
+    the NumPy buffers allocated by it.
+
+    :param function: A callable without arguments.
+    :param repeat: Number of timed calls. Default is 3.
+    :return: A tuple of the time in seconds and the peak memory in bytes.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peak
+
+def scratch(names=None, count=10 ** 5, log=None):
+    """
+    Checks that evaluations into an `out=` array reuse their buffers instead of allocating
+    memory for every node of the fit or point of the stencil. The peak memory traced while
+    evaluating, which excludes `out` itself, has to stay within the budget of the case
+    and must not grow with the number of points.
+
+    :param names: Names of the evaluations to check, all of them by default.
+    :param count: Query size of the evaluations. Default is 10^5.
+    :param log: Optional callable receiving a line of progress for every measurement.
+    :return: A list of tuples of the name, the number of points and the scratch memory in
+        arrays of the size of `out`, for every evaluation over its budget or growing with
+        the number of points.
+    :rtype: list
+    """
+    failures = []
+    for name in names or SCRATCH:
+        setup, counts, budget = SCRATCH[name]
+        smallest = None
+        for points in counts:
+            function, out = setup(points, count)
+            _, peak = measure(function, repeat=1)
+            buffers = peak / out.nbytes
+            if log is not None:
+                log(f"{name:32} points={points:<10} {buffers:8.2f} buffers of {budget}")
+
+            smallest = buffers if smallest is None else smallest
+            if buffers > budget or buffers > smallest * 1.01 + 0.01:
+                failures.append((name, points, buffers))
+
+    return failures
+
+def run(names=None, repeat=3, max_size=None, max_queries=None, log=None):
+    """
+    Runs the benchmark cases over all their problem sizes and, for the cases evaluating
+    a fit, over all their query sizes, so that the cost of the evaluation can be told
+    apart from the cost of the fit.
+
+    :param names: Names of the cases to run, all cases by default.
+    :param repeat: Number of timed calls per case and size. Default is 3.
+    :param max_size: Largest problem size to run, all sizes by default.
+    :param max_queries: Largest query size to run, all query sizes by default.
+    :param log: Optional callable receiving a line of progress for every measurement.
+    :return: A dictionary with the environment under "environment" and, under "results",
+        the time and the peak memory of every case, size and query size. Measurements
+        are keyed by the size, followed by "x" and the query size for cases with queries.
+    :rtype: dict
+    """
+    results = dict()
+    for name in names or CASES:
+        setup, sizes, query_sizes = CASES[name]
+        results[name] = dict()
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+
+            for queries in query_sizes or [None]:
+                if queries is None:
+                    key, function = str(size), setup(size)
+                elif max_queries is None or queries <= max_queries:
+                    key, function = f"{size}x{queries}", setup(size, queries)
+                else:
+                    continue
+
+                seconds, peak = measure(function, repeat)
+                results[name][key] = {"time": seconds, "memory": peak}
+                if log is not None:
+                    log(f"{name:32} n={key:<17} {seconds * 1000:12.3f} ms {peak / 2 ** 20:10.2f} MiB")
+
+    environment = {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine()}
+
+    return {"environment": environment, "results": results}
+
+def compare(results, baseline, threshold=0.25):
+    """
+    Compares benchmark results against a baseline run. A measurement is a regression
+    when its time or its peak memory exceeds the baseline by more than `threshold`.
+    Cases, sizes and query sizes missing from either run are skipped.
+
+    :param results: Results of `run`.
+    :param baseline: Results of an earlier `run`, for example loaded from a JSON file.
+    :param threshold: Allowed relative increase. Default is 0.25.
+    :return: A list of tuples of the case name, the key of the size and query size (see
+        `run`), the metric and the ratio of the result to the baseline, for every regression.
+    :rtype: list
+    """
+    regressions = []
+    for name, sizes in results["results"].items():
+        for size, measurements in sizes.items():
+            reference = baseline["results"].get(name, dict()).get(size)
+            if reference is None:
+                continue
+
+            for metric in ("time", "memory"):
+                if reference[metric] > 0 and measurements[metric] > reference[metric] * (1 + threshold):
+                    regressions.append((name, size, metric, measurements[metric] / reference[metric]))
+
+    return regressions
+
+def plot(results, path):
+    """
+    Plots the scaling curves of time and peak memory over the problem size for every
+    case on log-log axes and saves the figure. Cases with queries get one curve per query
+    size. Requires matplotlib.
+
+    :param results: Results of `run`.
+    :param path: Path of the saved figure.
+    """
+    import matplotlib.pyplot as plt
+
+    figure, (time_axes, memory_axes) = plt.subplots(1, 2, figsize=(14, 6))
+    for name, sizes in results["results"].items():
+        curves = dict()
+        for key in sizes:
+            size, _, queries = key.partition("x")
+            curves.setdefault(f"{name} m={queries}" if queries else name, []).append((int(size), sizes[key]))
+
+        for label, points in curves.items():
+            ns = [size for size, _ in points]
+            time_axes.loglog(ns, [measurements["time"] for _, measurements in points], "o-", label=label)
+            memory_axes.loglog(ns, [max(measurements["memory"], 1) for _, measurements in points], "o-", label=label)
+
+    time_axes.set_xlabel("n")
+    time_axes.set_ylabel("Time [s]")
+    memory_axes.set_xlabel("n")
+    memory_axes.set_ylabel("Peak memory [B]")
+    time_axes.legend(fontsize="small")
+    time_axes.grid()
+    memory_axes.grid()
+
+    figure.savefig(path)
+    plt.close(figure)
\ No newline at end of file
@@ -1,9 +1,40 @@
 from .statistics import average
 from .statistics import median
+from .statistics import quantiles
 from .statistics import deviation
+from .statistics import grouped_average
+from .statistics import grouped_median
+from .statistics import grouped_deviation
+from .statistics import describe_by
+from .statistics import RunningStatistics
+from .statistics import TDigest
 from .interpolate import polynomial
+from .interpolate import NewtonInterpolant
+from .interpolate import barycentric
+from .interpolate import BarycentricInterpolant
+from .interpolate import chebyshev_nodes
 from .interpolate import spline
+from .interpolate import SplineInterpolant
+from .interpolate import StreamingSpline
+from .interpolate import bicubic
+from .interpolate import BicubicSpline
 from .approximate import polynomial
+from .approximate import PolynomialFit
 from .integrate import trapezoidal
+from .integrate import cumulative_trapezoidal
+from .integrate import IntegralIndex
+from .integrate import simpson
+from .integrate import romberg
+from .integrate import gauss_kronrod
 from .differentiation import differentiate
-from .differentiation import monotonicity
\ No newline at end of file
+from .differentiation import monotonicity
+from .differentiation import MonotonicSegments
+from .differentiation import differentiate_chunks
+from .differentiation import monotonicity_chunks
+from .grid import Grid
+from .sampling import adaptive
+from .loader import load
+from .loader import Table
+from .cache import FitCache
+from . import parallel
+from .profiling import profile
\ No newline at end of file
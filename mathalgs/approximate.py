@@ -1,6 +1,208 @@
+import copy
+import mathalgs as ma
 import numpy as np
 
-def polynomial(xs, ys, degree, approximating_xs):
+class PolynomialFit:
+    """
+    Polynomial of a given degree fitted to the input data using the method of fewest
+    squares, together with the quality metrics of the fit.
+
+    The coefficients are obtained from a QR factorization of the Vandermonde matrix,
+    which avoids forming the badly conditioned normal equations. The residuals, the
+    coefficient of determination (R^2) and the root-mean-square error are computed
+    from the same Vandermonde matrix during the fit.
+
+    For high degrees or wide ranges of x-values, the polynomial can be fitted in the
+    Chebyshev or Legendre basis instead of the monomial one. The x-values are then mapped
+    from their range, the `domain`, onto [-1, 1], the basis matrix is built with the
+    three-term recurrence of the basis, which keeps it well conditioned, and the fit is
+    evaluated with Clenshaw's algorithm.
+
+    The first `k + 1` columns of the QR factorization are the factorization of the fit of
+    degree `k`, so the fits of all lower degrees come from the same factorization. Their
+    metrics are available as `rmse_by_degree` and `r_squared_by_degree`, and `truncate`
+    returns the fit of a lower degree without fitting again.
+
+    Several series sharing the same x-coordinates can be fitted at once by passing a 2-D
+    `ys` of shape `(series, n)`. The factorization is then computed once for all series,
+    the coefficients and metrics gain a leading series axis and evaluation returns a
+    `(series, m)` array.
+
+    :param xs: List of x-coordinates corresponding to the data points for polynomial fitting.
+    :type xs: list[float]
+    :param ys: List of y-coordinates corresponding to the data points for polynomial fitting,
+        or a 2-D array with one series of y-coordinates per row.
+    :type ys: list[float] | numpy.ndarray
+    :param degree: Degree of the polynomial to fit.
+    :type degree: int
+    :param basis: Basis of the coefficients, "monomial" (default), "chebyshev" or "legendre".
+    :type basis: str
+    :param dtype: Floating-point type of the fit and its evaluation, float64 by default.
+    :type dtype: numpy.dtype, optional
+    :raises ValueError: If the number of x-values and y-values provided as inputs are not equal.
+    :raises ValueError: If the basis is not one of the supported ones.
+    """
+
+    def __init__(self, xs, ys, degree, basis="monomial", dtype=float):
+        if len(xs) != np.shape(ys)[-1]:
+            raise ValueError("A different number of x and y values were given")
+        if basis not in ("monomial", "chebyshev", "legendre"):
+            raise ValueError("Basis has to be one of monomial, chebyshev or legendre")
+
+        dtype = ma.buffers.floating(dtype)
+        xs = np.asarray(xs, dtype=dtype)
+        ys = np.asarray(ys, dtype=dtype)
+
+        self.degree = degree
+        self.basis = basis
+
+        if basis == "monomial":
+            self.domain = None
+            vandermonde = np.vander(xs, degree + 1, increasing=True).astype(dtype, copy=False)
+        else:
+            self.domain = (float(np.min(xs)), float(np.max(xs)))
+            vandermonde = _basis_matrix(basis, degree, self._map(xs))
+
+        q, self._r = np.linalg.qr(vandermonde)
+        self._projections = (q.T @ ys.T).T
+        self.coefficients = np.linalg.solve(self._r, self._projections.T).T
+
+        self.residuals = ys - self.coefficients @ vandermonde.T
+        residual_sum = np.sum(self.residuals ** 2, axis=-1)
+        total_sum = np.sum((ys - np.mean(ys, axis=-1, keepdims=True)) ** 2, axis=-1)
+
+        self.rmse = np.sqrt(residual_sum / len(xs))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.r_squared = 1 - residual_sum / total_sum
+
+        # Dropping the column k of the factorization adds the square of its projection to the residual sum.
+        dropped = np.cumsum(self._projections[..., :0:-1] ** 2, axis=-1)[..., ::-1]
+        residual_sums = residual_sum[..., None] + np.concatenate((dropped, np.zeros(dropped.shape[:-1] + (1,))), axis=-1)
+
+        self.rmse_by_degree = np.sqrt(residual_sums / len(xs))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.r_squared_by_degree = 1 - residual_sums / total_sum[..., None]
+
+    def __call__(self, approximating_xs, out=None):
+        """
+        Evaluates the fitted polynomial at the given x-values using Horner's scheme, or
+        Clenshaw's algorithm for the orthogonal bases.
+
+        :param approximating_xs: List of x-values at which the polynomial function is evaluated.
+        :type approximating_xs: list[float]
+        :param out: Array to store the approximated y-values in, so that a buffer can be
+            reused across evaluations.
+        :type out: numpy.ndarray, optional
+        :return: Array of approximated y-values corresponding to the input approximating_xs,
+            with a leading series axis when several series were fitted.
+        :rtype: numpy.ndarray
+        """
+        approximating_xs = np.asarray(approximating_xs, dtype=self.coefficients.dtype)
+        points = approximating_xs.ravel()
+
+        result = ma.buffers.output(out, self.coefficients.shape[:-1] + approximating_xs.shape, self.coefficients.dtype)
+        approximating_ys = result.reshape(self.coefficients.shape[:-1] + points.shape)
+
+        if self.basis != "monomial":
+            approximating_ys[...] = _clenshaw(self.basis, self.coefficients, self._map(points))
+            return result
+
+        approximating_ys += self.coefficients[..., -1, None]
+        for i in range(self.degree - 1, -1, -1):
+            approximating_ys *= points
+            approximating_ys += self.coefficients[..., i, None]
+
+        return result
+
+    def truncate(self, degree):
+        """
+        Returns the fit of a lower degree to the same data in the same basis, solved from
+        the factorization of this fit. The residuals of the data are not kept by the fit,
+        so `residuals` of the returned fit is None.
+
+        :param degree: Degree of the returned fit, at most the degree of this fit.
+        :type degree: int
+        :return: The fit of the given degree.
+        :rtype: PolynomialFit
+        :raises ValueError: If the degree is negative or greater than the degree of this fit.
+        """
+        if degree < 0 or degree > self.degree:
+            raise ValueError("Degree has to be between 0 and the degree of the fit")
+
+        fit = copy.copy(self)
+        fit.degree = degree
+        fit._r = self._r[:degree + 1, :degree + 1]
+        fit._projections = self._projections[..., :degree + 1]
+        fit.coefficients = np.linalg.solve(fit._r, fit._projections.T).T
+        fit.residuals = None
+        fit.rmse = self.rmse_by_degree[..., degree]
+        fit.r_squared = self.r_squared_by_degree[..., degree]
+        fit.rmse_by_degree = self.rmse_by_degree[..., :degree + 1]
+        fit.r_squared_by_degree = self.r_squared_by_degree[..., :degree + 1]
+
+        return fit
+
+    def roots(self, value=0.0):
+        """
+        Finds the real x-values where the fitted polynomial equals a value, as the
+        eigenvalues of its companion matrix, computed for all series at once and refined
+        with Newton's method.
+
+        :param value: Value to find. Default is 0.
+        :type value: float
+        :return: Array of the x-values in ascending order. When several series were fitted,
+            a tuple of an array of series indices and an array of x-values, ordered by
+            series and x-value.
+        :rtype: numpy.ndarray | tuple[numpy.ndarray, numpy.ndarray]
+        """
+        coefficients = self._power_coefficients()
+        coefficients[:, 0] -= value
+
+        series, locations = _polynomial_roots(coefficients)
+        locations = self._unmap(locations)
+        return locations if self.coefficients.ndim == 1 else (series, locations)
+
+    def extrema(self):
+        """
+        Finds the local extrema of the fitted polynomial, as the real roots of its
+        derivative at which the second derivative doesn't vanish.
+
+        :return: A tuple of an array of the x-values of the extrema in ascending order and
+            a boolean array which is True for maxima and False for minima. When several
+            series were fitted, the tuple starts with an array of series indices.
+        :rtype: tuple
+        """
+        coefficients = self._power_coefficients()
+        derivative = coefficients[:, 1:] * np.arange(1, self.degree + 1)
+        curvature = derivative[:, 1:] * np.arange(1, self.degree)
+
+        series, locations = _polynomial_roots(derivative)
+        curvatures = _evaluate(curvature, series, locations)
+
+        simple = curvatures != 0
+        series, locations, maxima = series[simple], self._unmap(locations[simple]), curvatures[simple] < 0
+        return (locations, maxima) if self.coefficients.ndim == 1 else (series, locations, maxima)
+
+    def _map(self, xs):
+        start, end = self.domain
+        return (2 * xs - (start + end)) / ((end - start) or 1.0)
+
+    def _unmap(self, ts):
+        if self.domain is None:
+            return ts
+
+        start, end = self.domain
+        return ((start + end) + ts * ((end - start) or 1.0)) / 2
+
+    def _power_coefficients(self):
+        # Coefficients of the powers of x, or of the mapped x-values for the orthogonal bases.
+        coefficients = self.coefficients.reshape(-1, self.degree + 1)
+        if self.basis == "monomial":
+            return np.array(coefficients)
+
+        return coefficients @ _basis_powers(self.basis, self.degree)
+
+def polynomial(xs, ys, degree, approximating_xs, basis="monomial", out=None, dtype=float):
     """
     Computes and evaluates a polynomial function of a given degree based on the input data,
     using the method of fewest squares for polynomial regression. It returns the approximated
@@ -8,42 +210,142 @@ def polynomial(xs, ys, degree, approximating_xs):
 
     The function constructs a Vandermonde matrix to compute the coefficients of the polynomial
     that best fits the input data points. It then evaluates this polynomial at specified
-    x-values for approximation.
+    x-values for approximation. When the same data is evaluated repeatedly, or the quality
+    of the fit is needed, use `PolynomialFit` instead, or enable `cache` to reuse the
+    fit across calls.
 
     :param xs: List of x-coordinates corresponding to the data points for polynomial fitting.
     :type xs: list[float]
-    :param ys: List of y-coordinates corresponding to the data points for polynomial fitting.
-    :type ys: list[float]
+    :param ys: List of y-coordinates corresponding to the data points for polynomial fitting,
+        or a 2-D array of shape `(series, n)` to fit several series at once.
+    :type ys: list[float] | numpy.ndarray
     :param degree: Degree of the polynomial to fit.
     :type degree: int
     :param approximating_xs: List of x-values at which the polynomial function is evaluated to produce
                              approximated y-values.
     :type approximating_xs: list[float]
-    :return: List of approximated y-values corresponding to the input approximating_xs.
-    :rtype: list[float]
+    :param basis: Basis of the fit, "monomial" (default), "chebyshev" or "legendre", see
+        `PolynomialFit`. The orthogonal bases stay well conditioned at high degrees.
+    :type basis: str
+    :param out: Array to store the approximated y-values in.
+    :type out: numpy.ndarray, optional
+    :param dtype: Floating-point type of the fit and its evaluation, float64 by default.
+    :type dtype: numpy.dtype, optional
+    :return: List of approximated y-values corresponding to the input approximating_xs,
+        or a `(series, m)` array for a 2-D `ys`.
+    :rtype: list[float] | numpy.ndarray
     :raises ValueError: If the number of x-values and y-values provided as inputs are not equal.
+    :raises ValueError: If the basis is not one of the supported ones.
+    """
+    return ma.cache.fitted(PolynomialFit, xs, ys, degree, basis=basis, dtype=dtype)(approximating_xs, out=out)
+
+def _evaluate(coefficients, series, xs):
+    """
+    Evaluates the polynomial of the given series at every x-value using Horner's scheme.
+
+    :param coefficients: Array of shape `(series, degree + 1)` with the coefficients of
+        every series in increasing order.
+    :param series: Array of series indices, one per x-value.
+    :param xs: Array of x-values.
+    :return: Array of the values of the polynomials at `xs`.
+    """
+    values = np.zeros(len(xs))
+    for i in range(coefficients.shape[1] - 1, -1, -1):
+        values = values * xs + coefficients[series, i]
+
+    return values
+
+def _polynomial_roots(coefficients):
+    """
+    Finds the real roots of many polynomials of the same degree at once. The roots are
+    the eigenvalues of the companion matrices of all polynomials, computed as one batch.
+    The eigenvalues whose imaginary part is negligible are taken as real roots and
+    refined by a few steps of Newton's method.
+
+    :param coefficients: Array of shape `(series, degree + 1)` with the coefficients of
+        every series in increasing order. The leading coefficients have to be non-zero.
+    :return: A tuple of the series indices and the real roots, ordered by series and root.
     """
-    if len(xs) != len(ys):
-        raise ValueError("A different number of x and y values were given")
+    series_count, size = coefficients.shape
+    degree = size - 1
+    if degree < 1:
+        return np.zeros(0, dtype=int), np.zeros(0)
 
-    length = degree + 1
+    companion = np.zeros((series_count, degree, degree))
+    companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        companion[:, :, -1] = -coefficients[:, :-1] / coefficients[:, -1:]
 
-    raised_xs = np.zeros((length, length))
-    for i in range(length):
-        for j in range(length):
-            for k in range(len(xs)):
-                raised_xs[i][j] += xs[k]**(i + j)
+    eigenvalues = np.linalg.eigvals(np.nan_to_num(companion, nan=0.0, posinf=0.0, neginf=0.0))
+    real = np.abs(eigenvalues.imag) <= 1e-8 * np.maximum(1, np.abs(eigenvalues))
+    real &= np.isfinite(coefficients[:, -1:]) & (coefficients[:, -1:] != 0)
 
-    raised_ys = np.zeros(length)
-    for i in range(length):
-        for j in range(len(xs)):
-            raised_ys[i] += ys[j] * xs[j]**i
+    series, _ = np.nonzero(real)
+    roots = eigenvalues.real[real]
 
-    polynomials = np.linalg.solve(raised_xs, raised_ys)
+    derivative = coefficients[:, 1:] * np.arange(1, size)
+    for _ in range(3):
+        slopes = _evaluate(derivative, series, roots)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            steps = _evaluate(coefficients, series, roots) / slopes
+        roots = np.where(np.isfinite(steps), roots - steps, roots)
+
+    order = np.lexsort((roots, series))
+    return series[order], roots[order]
+
+def _recurrence(basis, k):
+    """
+    Returns the factors `a` and `b` of the three-term recurrence
+    `P[k + 1](t) = a * t * P[k](t) + b * P[k - 1](t)` of an orthogonal basis.
+    """
+    if basis == "chebyshev":
+        return (1.0 if k == 0 else 2.0), -1.0
+
+    return (2 * k + 1) / (k + 1), -k / (k + 1)
+
+def _basis_matrix(basis, degree, ts):
+    """
+    Builds the matrix of the basis polynomials of degrees 0 to `degree` evaluated at the
+    mapped x-values, one column per degree, with the three-term recurrence of the basis.
+    """
+    columns = [np.ones(len(ts), dtype=ts.dtype), ts][:degree + 1]
+    for k in range(1, degree):
+        a, b = _recurrence(basis, k)
+        columns.append(a * ts * columns[k] + b * columns[k - 1])
+
+    return np.stack(columns, axis=-1)
+
+def _basis_powers(basis, degree):
+    """
+    Builds the matrix converting coefficients in an orthogonal basis to the coefficients
+    of the powers of the mapped x-values, with a row per basis polynomial.
+    """
+    powers = np.eye(degree + 1)
+    for k in range(1, degree):
+        a, b = _recurrence(basis, k)
+        powers[k + 1] = a * np.roll(powers[k], 1) + b * powers[k - 1]
+
+    return powers
+
+def _clenshaw(basis, coefficients, ts):
+    """
+    Evaluates a series in an orthogonal basis at the mapped x-values with Clenshaw's
+    algorithm, which runs the three-term recurrence of the basis backwards.
+
+    :param basis: "chebyshev" or "legendre".
+    :param coefficients: Array of coefficients along the last axis, leading axes hold
+        independent series.
+    :param ts: Array of x-values mapped onto [-1, 1].
+    :return: Array of the values of every series at `ts`.
+    """
+    degree = coefficients.shape[-1] - 1
+    current = np.zeros(coefficients.shape[:-1] + ts.shape, dtype=coefficients.dtype)
+    following = np.zeros(coefficients.shape[:-1] + ts.shape, dtype=coefficients.dtype)
 
-    approximating_ys = np.zeros(len(approximating_xs))
-    for i in range(len(approximating_xs)):
-        for j in range(len(polynomials)):
-            approximating_ys[i] +=  polynomials[j] * approximating_xs[i]**j
+    for k in range(degree, 0, -1):
+        a, _ = _recurrence(basis, k)
+        _, b = _recurrence(basis, k + 1)
+        current, following = coefficients[..., k, None] + a * ts * current + b * following, current
 
-    return approximating_ys
\ No newline at end of file
+    _, b = _recurrence(basis, 1)
+    return coefficients[..., 0, None] + ts * current + b * following
\ No newline at end of file
@@ -0,0 +1,44 @@
+import numpy as np
+
+def output(out, shape, dtype=float):
+    """
+    Returns the array a result of the given shape is computed into. It is `out` when
+    given, so that callers evaluating in a loop can reuse one buffer, or a new array
+    otherwise. The array is filled with zeros, ready for the results to be accumulated.
+
+    :param out: Array to compute the result into, or None for a new array. It has to be
+        a C-contiguous array of a floating-point type, so that it can be reshaped without
+        copying and hold the results.
+    :param shape: Shape of the result.
+    :param dtype: Data type of a new array. Default is float64.
+    :return: The zero-filled array.
+    :raises ValueError: If `out` doesn't have the shape of the result, is not C-contiguous
+        or is not of a floating-point type.
+    """
+    if out is None:
+        return np.zeros(shape, dtype=dtype)
+
+    if out.shape != tuple(shape):
+        raise ValueError(f"Output array has to have the shape {tuple(shape)} of the result")
+    if not out.flags.c_contiguous:
+        raise ValueError("Output array has to be C-contiguous")
+    if not np.issubdtype(out.dtype, np.floating):
+        raise ValueError("Output array has to be of a floating-point type")
+
+    out.fill(0)
+    return out
+
+def floating(dtype):
+    """
+    Validates a data type of computation, which has to be a floating-point type such as
+    float64 (the default everywhere) or float32 for memory-bound workloads.
+
+    :param dtype: The data type, for example `float` or `numpy.float32`.
+    :return: The data type as a `numpy.dtype`.
+    :raises ValueError: If the data type is not a floating-point type.
+    """
+    dtype = np.dtype(dtype)
+    if not np.issubdtype(dtype, np.floating):
+        raise ValueError("Data type has to be a floating-point type")
+
+    return dtype
\ No newline at end of file
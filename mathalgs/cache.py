@@ -0,0 +1,177 @@
+import collections
+import contextlib
+import hashlib
+import threading
+import numpy as np
+
+class FitCache:
+    """
+    Least recently used cache of fitted objects, such as interpolants and least-squares
+    fits, keyed by the content of the data they were fitted to.
+
+    The key of a fit is a BLAKE2 hash of the bytes, the data type and the shape of every
+    data argument, together with the class of the fitted object and its parameters. Equal
+    data passed in different buffers or as lists therefore hits the same entry. Once the
+    fitted objects take more memory than `max_bytes` (or there are more than `max_entries`
+    of them), the least recently used ones are evicted.
+
+    Cached objects are shared between all callers, so they must not be modified.
+
+    :param max_bytes: Memory budget of the NumPy arrays held by the cached objects.
+        Default is 256 MiB.
+    :param max_entries: Optional limit of the number of cached objects.
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fitted(self, constructor, *arguments, **parameters):
+        """
+        Returns the object fitted by `constructor(*arguments, **parameters)`, fitting and
+        caching it only if equal data and parameters haven't been fitted before.
+
+        :param constructor: Class of the fitted object, such as `SplineInterpolant`.
+        :param arguments: Data arguments of the constructor, hashed by content.
+        :param parameters: Keyword parameters of the constructor, compared by value.
+        :return: The fitted object.
+        """
+        key = _key(constructor, arguments, parameters)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        fitted = constructor(*arguments, **parameters)
+        size = _nbytes(fitted)
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (fitted, size)
+                self.size += size
+                self._evict()
+
+        return fitted
+
+    def _evict(self):
+        while self.size > self.max_bytes or (self.max_entries is not None and len(self._entries) > self.max_entries):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Removes all cached objects, keeping the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        :return: A dictionary with the number of hits, misses and evictions, the number
+            of cached objects and the memory they take in bytes.
+        :rtype: dict
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self._entries), "bytes": self.size}
+
+_cache = None
+
+def enable(max_bytes=256 * 2 ** 20, max_entries=None):
+    """
+    Enables caching of the fits made by the one-shot functions `interpolate.polynomial`,
+    `interpolate.barycentric`, `interpolate.spline` and `approximate.polynomial`, so that
+    repeated calls on the same data only pay for the evaluation.
+
+    :param max_bytes: Memory budget of the cache. Default is 256 MiB.
+    :param max_entries: Optional limit of the number of cached fits.
+    :return: The enabled cache, or the current one when caching is already enabled.
+    :rtype: FitCache
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = FitCache(max_bytes, max_entries)
+
+    return _cache
+
+def disable():
+    """
+    Disables caching of fits and drops the cache.
+
+    :return: The cache that was enabled, or None.
+    :rtype: FitCache
+    """
+    global _cache
+
+    cache, _cache = _cache, None
+    return cache
+
+def current():
+    """
+    :return: The enabled cache, or None if caching is disabled.
+    :rtype: FitCache
+    """
+    return _cache
+
+@contextlib.contextmanager
+def caching(max_bytes=256 * 2 ** 20, max_entries=None):
+    """
+    Enables caching of fits for the duration of a `with` block and restores the previous
+    state afterwards.
+
+    :param max_bytes: Memory budget of the cache. Default is 256 MiB.
+    :param max_entries: Optional limit of the number of cached fits.
+    :return: A context manager yielding the enabled cache.
+    """
+    was_enabled = _cache is not None
+    cache = enable(max_bytes, max_entries)
+    try:
+        yield cache
+    finally:
+        if not was_enabled:
+            disable()
+
+def fitted(constructor, *arguments, **parameters):
+    """
+    Fits `constructor(*arguments, **parameters)` through the enabled cache, or directly
+    when caching is disabled.
+
+    :param constructor: Class of the fitted object.
+    :param arguments: Data arguments of the constructor.
+    :param parameters: Keyword parameters of the constructor.
+    :return: The fitted object.
+    """
+    if _cache is None:
+        return constructor(*arguments, **parameters)
+
+    return _cache.fitted(constructor, *arguments, **parameters)
+
+def _key(constructor, arguments, parameters):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{constructor.__module__}.{constructor.__qualname__}".encode())
+
+    for argument in arguments:
+        array = np.ascontiguousarray(argument)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data if array.dtype != object else repr(array.tolist()).encode())
+
+    digest.update(repr(sorted(parameters.items())).encode())
+
+    return digest.digest()
+
+def _nbytes(fitted):
+    return sum(value.nbytes for value in vars(fitted).values() if isinstance(value, np.ndarray))
\ No newline at end of file
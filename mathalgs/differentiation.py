@@ -1,59 +1,186 @@
+from collections.abc import Mapping
 import numpy as np
-import mathalgs.statistics as st
+import mathalgs.buffers as bf
+import mathalgs.grid as gr
 
-def differentiate(xs, ys, degree=1):
+def differentiate(xs, ys, degree=1, accuracy=2, uniform=True, step=None, out=None, dtype=float):
     """
-    Calculates the first or second numerical derivative of a set of y-values
-    with respect to corresponding x-values. The function uses numerical
-    differentiation methods based on finite differences. It ensures that the
-    x-values provided are evenly spaced and of the same length as the y-values.
-    Different calculations are made based on the specified derivative degree.
+    Calculates a numerical derivative of any degree of a set of y-values with respect to
+    corresponding x-values. The function uses numerical differentiation methods based on
+    finite differences, with central stencils of the selected order of accuracy inside the
+    data. Near both ends, the stencils are shifted inside the data and have
+    `degree + accuracy - 1` points, one order of accuracy less than the central ones.
+    The stencils are applied to whole slices of the data at once.
+
+    By default, it ensures that the x-values provided are evenly spaced, in which case the
+    stencil weights are computed only once. With `uniform` set to False, the x-values may
+    be irregularly spaced and the weights of every stencil are computed from the actual
+    spacings, so the data doesn't have to be resampled first. When the spacing of evenly
+    spaced x-values is known in advance, it can be given as `step`, or the x-values can be
+    given as a `Grid`, which skips the check.
 
     :param xs: Sequence of x-values
-    :type xs: list or numpy.ndarray
-    :param ys: Sequence of y-values corresponding to the x-values
+    :type xs: list or numpy.ndarray or Grid
+    :param ys: Sequence of y-values corresponding to the x-values, or a 2-D array with
+               one series of y-values per row
     :type ys: list or numpy.ndarray
     :param degree: Degree of the derivative to calculate (1 for first derivative,
-                   2 for second derivative). Default is 1.
+                   2 for second derivative and so on). Default is 1.
     :type degree: int
+    :param accuracy: Order of accuracy of the central stencils, a positive even number
+                     such as 2, 4 or 6. Default is 2.
+    :type accuracy: int
+    :param uniform: Whether xs are evenly spaced. Default is True.
+    :type uniform: bool
+    :param step: Spacing of the evenly spaced xs, computed from xs when not given.
+    :type step: float, optional
+    :param out: Array to store the derivatives in, of the shape of ys.
+    :type out: numpy.ndarray, optional
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :type dtype: numpy.dtype, optional
     :raises ValueError: If the lengths of xs and ys differ
-    :raises ValueError: If xs are not equally spaced based on standard deviation
-    :raises ValueError: If the degree is neither 1 nor 2
+    :raises ValueError: If xs are expected to be, but are not equally spaced based on
+                        standard deviation
+    :raises ValueError: If the degree is not a positive integer
+    :raises ValueError: If the accuracy is not a positive even integer
+    :raises ValueError: If there are fewer points than the stencils near the ends need
     :return: A numpy array containing the computed derivatives
     :rtype: numpy.ndarray
     """
-    if len(xs) != len(ys):
+    if len(xs) != np.shape(ys)[-1]:
         raise ValueError("A different number of x and y values were given")
-    if st.deviation(np.diff(xs)) > 0.001:
-        raise ValueError("Given x values are not equally spaced")
+    if degree < 1:
+        raise ValueError("Derivative degree has to be a positive integer")
+    if accuracy < 2 or accuracy % 2 != 0:
+        raise ValueError("Accuracy order has to be a positive even integer")
 
     length = len(xs)
-    diff = st.average(np.diff(xs))
-    result_derivatives = np.zeros(length)
+    reach = (degree + 1) // 2 + accuracy // 2 - 1
+    boundary = degree + accuracy - 1
+    if length < boundary:
+        raise ValueError(f"At least {boundary} points are required for this derivative")
+    if uniform and step is None:
+        step = gr.spacing(xs)
 
-    if degree == 1:
-        result_derivatives[0] = (ys[1] - ys[0]) / diff
-        for i in range(1, length - 1):
-            result_derivatives[i] = (ys[i + 1] - ys[i - 1]) / (2 * diff)
-        result_derivatives[-1] = (ys[-1] - ys[-2]) / diff
+    dtype = bf.floating(dtype)
+    xs = np.asarray(xs, dtype=dtype)
+    ys = np.asarray(ys, dtype=dtype)
 
-    elif degree == 2:
-        result_derivatives[0] = (ys[2] - 2 * ys[1] + ys[0]) / (diff ** 2)
-        for i in range(1, length - 1):
-            result_derivatives[i] = (ys[i - 1] - 2 * ys[i] + ys[i + 1]) / (diff ** 2)
-        result_derivatives[-1] = (ys[-1] - 2 * ys[-2] + ys[-3]) / (diff ** 2)
+    inner = np.arange(reach, length - reach)
+    left = np.arange(min(reach, length))
+    right = np.arange(max(reach, length - reach), length)
 
+    if uniform:
+        scale = step ** degree
+        inner_offsets = np.arange(-reach, reach + 1)[None, :]
+        left_offsets = np.arange(boundary)[None, :] - left[:, None]
+        right_offsets = np.arange(length - boundary, length)[None, :] - right[:, None]
     else:
-        raise ValueError("There are only first and second derivative able to be calculated")
+        scale = 1
+        inner_offsets = xs[inner[:, None] + np.arange(-reach, reach + 1)] - xs[inner, None]
+        left_offsets = xs[None, :boundary] - xs[left, None]
+        right_offsets = xs[None, length - boundary:] - xs[right, None]
+
+    result_derivatives = bf.output(out, ys.shape, dtype)
+
+    weights = _stencil_weights(inner_offsets, degree).astype(dtype)
+    inner_derivatives = result_derivatives[..., reach:length - reach]
+    terms = np.empty_like(inner_derivatives)
+    for k in range(2 * reach + 1):
+        inner_derivatives += np.multiply(weights[:, k], ys[..., k:k + len(inner)], out=terms)
+
+    weights = _stencil_weights(left_offsets, degree).astype(dtype)
+    for k in range(boundary):
+        result_derivatives[..., left] += weights[:, k] * ys[..., k, None]
+
+    weights = _stencil_weights(right_offsets, degree).astype(dtype)
+    for k in range(boundary):
+        result_derivatives[..., right] += weights[:, k] * ys[..., length - boundary + k, None]
+
+    result_derivatives /= scale
 
     return result_derivatives
 
-def monotonicity(xs, ys, derivatives=None):
+def _stencil_weights(offsets, degree):
+    """
+    Computes finite difference weights using Fornberg's algorithm.
+
+    :param offsets: Array of stencil point positions relative to the point where the
+        derivative is calculated, with the stencil points along the last axis. Leading
+        axes hold independent stencils, which are all computed at once.
+    :param degree: Degree of the derivative.
+    :return: Array of weights in the shape of `offsets`.
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    count = offsets.shape[-1]
+
+    weights = np.zeros(offsets.shape + (degree + 1,))
+    weights[..., 0, 0] = 1
+
+    c1 = np.ones(offsets.shape[:-1])
+    c4 = offsets[..., 0]
+    for i in range(1, count):
+        c2 = np.ones(offsets.shape[:-1])
+        c5 = c4
+        c4 = offsets[..., i]
+        for j in range(i):
+            c3 = offsets[..., i] - offsets[..., j]
+            c2 = c2 * c3
+            if j == i - 1:
+                for k in range(min(i, degree), 0, -1):
+                    weights[..., i, k] = c1 * (k * weights[..., i - 1, k - 1] - c5 * weights[..., i - 1, k]) / c2
+                weights[..., i, 0] = -c1 * c5 * weights[..., i - 1, 0] / c2
+            for k in range(min(i, degree), 0, -1):
+                weights[..., j, k] = (c4 * weights[..., j, k] - k * weights[..., j, k - 1]) / c3
+            weights[..., j, 0] = c4 * weights[..., j, 0] / c3
+        c1 = c2
+
+    return weights[..., degree]
+
+class MonotonicSegments(Mapping):
+    """
+    Run-length encoded monotonicity of a set of data points, as returned by `monotonicity`.
+
+    The segments are stored compactly in parallel arrays: `starts` and `ends` with their
+    indices and `states` with 1 for increasing, -1 for decreasing and 0 for steady
+    segments. As a read-only mapping, the result also offers a dictionary view with the
+    keys "increases", "decreases" and "steady", each mapping to a list of tuples of the
+    start and end indices of the segments in that state.
+
+    :param starts: Array of start indices of the segments.
+    :param ends: Array of end indices of the segments.
+    :param states: Array of states of the segments.
+    """
+
+    _names = {"increases": 1, "decreases": -1, "steady": 0}
+
+    def __init__(self, starts, ends, states):
+        self.starts = starts
+        self.ends = ends
+        self.states = states
+
+    def __getitem__(self, name):
+        selected = self.states == self._names[name]
+        return list(zip(self.starts[selected].tolist(), self.ends[selected].tolist()))
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+def monotonicity(xs, ys, derivatives=None, tolerance=0):
     """
     Determines the monotonicity of a given set of data points by analyzing their derivatives.
     Calculates whether the function represented by the data points is increasing, decreasing,
     or steady over specific segments of the input range and organizes the results by monotonicity type.
 
+    The states of all derivatives are computed at once and run-length encoded at the points
+    where the state changes. Derivatives within `tolerance` of zero are considered steady.
+
     :param xs: A list of x-values representing the independent variable.
     :type xs: list
     :param ys: A list of y-values corresponding to the x-values, representing the dependent variable.
@@ -61,39 +188,142 @@ def monotonicity(xs, ys, derivatives=None):
     :param derivatives: Optional. A list of pre-computed derivative values for the given points.
         If not provided, the derivatives will be calculated from the input data.
     :type derivatives: list, optional
-    :return: A dictionary containing three keys: "increases", "decreases", and "steady". Each key maps
-        to a list of tuples indicating the start and end indices for contiguous segments of the input
-        data where the function is increasing, decreasing, or steady, respectively.
-    :rtype: dict
+    :param tolerance: Optional. Largest absolute value of a derivative considered steady. Default is 0.
+    :type tolerance: float, optional
+    :return: A `MonotonicSegments` instance, which behaves as a dictionary containing three keys:
+        "increases", "decreases", and "steady". Each key maps to a list of tuples indicating the start
+        and end indices for contiguous segments of the input data where the function is increasing,
+        decreasing, or steady, respectively.
+    :rtype: MonotonicSegments
     """
     if derivatives is None:
         derivatives = differentiate(xs, ys)
     if len(xs) != len(ys) != len(derivatives):
         raise ValueError("A different number of x, y and derivative values were given")
 
-    result = dict()
-    result["increases"] = []
-    result["decreases"] = []
-    result["steady"] = []
+    derivatives = np.asarray(derivatives)
+    states = (derivatives > tolerance).astype(np.int8) - (derivatives < -tolerance)
+
+    changes = np.flatnonzero(states[1:] != states[:-1]) + 1
 
-    def get_state(_derivative):
-        if _derivative > 0:
-            return "increases"
-        elif _derivative < 0:
-            return "decreases"
+    starts = np.concatenate(([0], changes - 1))
+    ends = np.append(changes, len(xs))
+
+    return MonotonicSegments(starts, ends, states[np.concatenate(([0], changes))])
+
+def chunks(*arrays, size=65536):
+    """
+    Splits sequences of the same length, such as memory-mapped columns of a data file,
+    into consecutive slices. Slices of NumPy arrays are views, so memory-mapped data is
+    read only when a slice is used.
+
+    :param arrays: One or more sequences of the same length.
+    :param size: Number of elements in every slice, except possibly the last one.
+    :return: A generator of slices, or of tuples of slices when several sequences are given.
+    """
+    length = len(arrays[0])
+    if any(len(array) != length for array in arrays):
+        raise ValueError("A different number of values were given")
+
+    for start in range(0, length, size):
+        if len(arrays) == 1:
+            yield arrays[0][start:start + size]
         else:
-            return "steady"
+            yield tuple(array[start:start + size] for array in arrays)
+
+def differentiate_chunks(pieces, degree=1, accuracy=2, step=None):
+    """
+    Calculates a numerical derivative of data that arrives in chunks, yielding the
+    derivatives chunk by chunk. Only the few points that the stencils need across chunk
+    boundaries are kept between chunks, so the memory stays bounded by the chunk size.
+
+    Without `step`, the stencil weights are computed from the actual spacings, and the
+    derivatives are identical to those of `differentiate` with `uniform` set to False.
+    With `step`, the x-values are treated as evenly spaced with that spacing, and the
+    derivatives are identical to those of `differentiate` with the same `step`.
+
+    :param pieces: Iterable of `(xs, ys)` pairs of consecutive parts of the data, for
+                   example produced by `chunks` from memory-mapped arrays.
+    :type pieces: iterable
+    :param degree: Degree of the derivative to calculate. Default is 1.
+    :type degree: int
+    :param accuracy: Order of accuracy of the central stencils. Default is 2.
+    :type accuracy: int
+    :param step: Spacing of evenly spaced x-values.
+    :type step: float, optional
+    :return: A generator of numpy arrays with the derivatives, which concatenated give
+             the derivatives of the whole data.
+    :rtype: generator
+    """
+    reach = (degree + 1) // 2 + accuracy // 2 - 1
+    boundary = degree + accuracy - 1
+
+    buffer_xs = np.zeros(0)
+    buffer_ys = np.zeros(0)
+    offset = 0
+    emitted = 0
 
-    state = get_state(derivatives[0])
+    def derivatives_of_buffer():
+        return differentiate(buffer_xs, buffer_ys, degree, accuracy, uniform=step is not None, step=step)
+
+    for xs, ys in pieces:
+        if len(xs) != len(ys):
+            raise ValueError("A different number of x and y values were given")
+
+        buffer_xs = np.concatenate((buffer_xs, xs))
+        buffer_ys = np.concatenate((buffer_ys, ys))
+
+        end = offset + len(buffer_xs) - reach
+        if len(buffer_xs) < boundary or end <= emitted:
+            continue
+
+        yield derivatives_of_buffer()[emitted - offset:end - offset]
+        emitted = end
+
+        start = max(0, min(emitted - reach, offset + len(buffer_xs) - boundary))
+        buffer_xs = buffer_xs[start - offset:]
+        buffer_ys = buffer_ys[start - offset:]
+        offset = start
+
+    if offset + len(buffer_xs) > emitted:
+        yield derivatives_of_buffer()[emitted - offset:]
+
+def monotonicity_chunks(pieces, tolerance=0):
+    """
+    Determines the monotonicity of data from chunks of its derivatives, yielding every
+    segment as soon as it is complete. The segments are the same as those returned by
+    `monotonicity`, in the order of the data.
+
+    :param pieces: Iterable of arrays with consecutive parts of the derivatives, for
+        example produced by `differentiate_chunks`.
+    :type pieces: iterable
+    :param tolerance: Largest absolute value of a derivative considered steady. Default is 0.
+    :type tolerance: float
+    :return: A generator of `(state, (start, end))` pairs, where state is "increases",
+        "decreases" or "steady" and start and end are the indices of the segment.
+    :rtype: generator
+    """
+    names = {1: "increases", -1: "decreases", 0: "steady"}
+
+    state = None
     segment_start_index = 0
+    length = 0
 
-    for segment_end_index, derivative in enumerate(derivatives):
-        if get_state(derivative) == state:
+    for derivatives in pieces:
+        derivatives = np.asarray(derivatives)
+        states = (derivatives > tolerance).astype(int) - (derivatives < -tolerance)
+        if len(states) == 0:
             continue
+        if state is None:
+            state = states[0]
+
+        previous = np.concatenate(([state], states[:-1]))
+        for index in np.flatnonzero(states != previous).tolist():
+            yield names[state], (segment_start_index, length + index)
+            segment_start_index = length + index - 1
+            state = states[index]
 
-        result[state].append((segment_start_index, segment_end_index))
-        segment_start_index = segment_end_index - 1
-        state = get_state(derivative)
-    result[state].append((segment_start_index, len(xs)))
+        length += len(states)
 
-    return result
\ No newline at end of file
+    if state is not None:
+        yield names[state], (segment_start_index, length)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import numpy as np
+import mathalgs.statistics as st
+
+class Grid:
+    """
+    Validated x-coordinates, converted to a contiguous float64 buffer and checked for
+    equal spacing once, so that functions called on the same x-coordinates many times
+    don't repeat the conversion and the check.
+
+    A grid can be passed as `xs` to every function and class of mathalgs. It behaves as
+    a read-only sequence of its values and converts to a NumPy array without copying.
+    Functions which need evenly spaced x-coordinates, such as `interpolate.spline` and
+    `differentiation.differentiate`, use the stored step instead of checking the spacing.
+
+    :param xs: List or array of x-coordinates in ascending order.
+    :raises ValueError: If no x-coordinates are given.
+    """
+
+    def __init__(self, xs):
+        if len(xs) == 0:
+            raise ValueError("At least one x value is required")
+
+        self.values = np.array(xs, dtype=float)
+        self.values.flags.writeable = False
+        self.start = float(self.values[0])
+        self.end = float(self.values[-1])
+
+        steps = np.diff(self.values)
+        if len(steps) > 0 and st.deviation(steps) <= 0.001:
+            self.step = st.average(steps)
+        else:
+            self.step = None
+
+    @property
+    def uniform(self):
+        """
+        Whether the x-coordinates are evenly spaced, in which case `step` holds the spacing.
+        """
+        return self.step is not None
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.values, dtype=dtype)
+        return self.values if dtype is None else self.values.astype(dtype, copy=False)
+
+    def __repr__(self):
+        return f"Grid(start={self.start}, end={self.end}, count={len(self)}, step={self.step})"
+
+def spacing(xs):
+    """
+    Returns the spacing of evenly spaced x-coordinates. For a `Grid` the stored step is
+    returned without checking the x-coordinates again.
+
+    :param xs: List or array of x-coordinates, or a `Grid`.
+    :return: The spacing between consecutive x-coordinates.
+    :raises ValueError: If the x values are not equally spaced.
+    """
+    if isinstance(xs, Grid):
+        if xs.step is None:
+            raise ValueError("Given x values are not equally spaced")
+        return xs.step
+
+    steps = np.diff(xs)
+    if st.deviation(steps) > 0.001:
+        raise ValueError("Given x values are not equally spaced")
+
+    return st.average(steps)
\ No newline at end of file
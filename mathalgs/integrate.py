@@ -1,4 +1,7 @@
-def trapezoidal(xs, ys):
+import numpy as np
+import mathalgs.buffers as bf
+
+def trapezoidal(xs, ys, dtype=float):
     """
     Integrates the given set of data points using the trapezoidal rule. The trapezoidal rule
     is used to estimate the definite integral of a function based on the provided x and y
@@ -12,6 +15,8 @@ def trapezoidal(xs, ys):
     :param ys: List of y-coordinates representing the dependent variable values corresponding
         to the x-coordinates. The length of this list must match the length of `xs`.
     :type ys: list[float]
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :type dtype: numpy.dtype, optional
     :return: The numerical approximation of the integral using the trapezoidal rule.
     :rtype: float
     :raises ValueError: If the lengths of `xs` and `ys` are different, or if fewer than two
@@ -22,4 +27,269 @@ def trapezoidal(xs, ys):
     if len(xs) < 2:
         raise ValueError("At least two points are required for integration")
 
-    return sum([((xs[i + 1] - xs[i]) * (ys[i+1] + ys[i])) for i in range(len(xs) - 1)])/2
\ No newline at end of file
+    dtype = bf.floating(dtype)
+    xs = np.asarray(xs, dtype=dtype)
+    ys = np.asarray(ys, dtype=dtype)
+
+    return float(np.sum(np.diff(xs) * (ys[1:] + ys[:-1]))) / 2
+
+def cumulative_trapezoidal(xs, ys, out=None, dtype=float):
+    """
+    Integrates the given set of data points cumulatively using the trapezoidal rule, that
+    is, computes the integral from the first x-coordinate up to every x-coordinate. The
+    last element equals the result of `trapezoidal`.
+
+    :param xs: List of x-coordinates representing the independent variable values. They
+        should be in ascending order and have at least two entries.
+    :type xs: list[float]
+    :param ys: List of y-coordinates corresponding to the x-coordinates, or a 2-D array
+        with one series of y-coordinates per row.
+    :type ys: list[float] | numpy.ndarray
+    :param out: Array to store the integrals in, of the shape of `ys`.
+    :type out: numpy.ndarray, optional
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :type dtype: numpy.dtype, optional
+    :return: Array of integrals of the same shape as `ys`, starting with zero.
+    :rtype: numpy.ndarray
+    :raises ValueError: If the lengths of `xs` and `ys` are different, or if fewer than two
+        points are provided in the input.
+    """
+    if len(xs) != np.shape(ys)[-1]:
+        raise ValueError("A different number of x and y values were given")
+    if len(xs) < 2:
+        raise ValueError("At least two points are required for integration")
+
+    dtype = bf.floating(dtype)
+    xs = np.asarray(xs, dtype=dtype)
+    ys = np.asarray(ys, dtype=dtype)
+
+    integrals = bf.output(out, ys.shape, dtype)
+    areas = np.add(ys[..., 1:], ys[..., :-1], out=integrals[..., 1:])
+    areas *= np.diff(xs)
+    areas /= 2
+    np.cumsum(areas, axis=-1, out=areas)
+
+    return integrals
+
+class IntegralIndex:
+    """
+    Index of prefix integrals of a sampled function, answering integrals over arbitrary
+    ranges in O(log n) each.
+
+    The data points are integrated cumulatively once with `cumulative_trapezoidal`. The
+    integral over [start, end] is then the difference of the prefix integrals at both
+    limits, where a limit lying between two data points is located by a binary search
+    and the remainder is integrated exactly under the straight line between them, in
+    agreement with the trapezoidal rule.
+
+    :param xs: List of x-coordinates in ascending order, with at least two entries.
+    :type xs: list[float]
+    :param ys: List of y-coordinates corresponding to the x-coordinates, or a 2-D array
+        with one series of y-coordinates per row.
+    :type ys: list[float] | numpy.ndarray
+    :raises ValueError: If the lengths of `xs` and `ys` are different, or if fewer than two
+        points are provided in the input.
+    """
+
+    def __init__(self, xs, ys):
+        self.prefix = cumulative_trapezoidal(xs, ys)
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+
+    def cumulative(self, x):
+        """
+        Computes the integral from the first x-coordinate up to the given x-values.
+
+        :param x: A number or an array of numbers within the range of the x-coordinates.
+        :return: Array of integrals in the shape of `x`, with a leading series axis when
+            several series were indexed.
+        :raises ValueError: If any x-value lies outside of the range of the x-coordinates.
+        """
+        x = np.asarray(x, dtype=float)
+        if np.any((x < self.xs[0]) | (x > self.xs[-1])):
+            raise ValueError("Integration limits have to lie within the range of x values")
+
+        intervals = np.clip(np.searchsorted(self.xs, x, side="right") - 1, 0, len(self.xs) - 2)
+        offsets = x - self.xs[intervals]
+        widths = self.xs[intervals + 1] - self.xs[intervals]
+
+        first = self.ys[..., intervals]
+        slopes = (self.ys[..., intervals + 1] - first) / widths
+
+        return self.prefix[..., intervals] + offsets * (first + slopes * offsets / 2)
+
+    def __call__(self, start, end):
+        """
+        Computes the integrals over the ranges [start, end]. Both limits can be arrays,
+        which are broadcast against each other to answer a batch of ranges at once.
+
+        :param start: Start of the range, or an array of starts.
+        :param end: End of the range, or an array of ends.
+        :return: Array of integrals over the ranges.
+        :raises ValueError: If any limit lies outside of the range of the x-coordinates.
+        """
+        start, end = np.broadcast_arrays(np.asarray(start, dtype=float), np.asarray(end, dtype=float))
+
+        return self.cumulative(end) - self.cumulative(start)
+
+def simpson(xs, ys):
+    """
+    Integrates the given set of data points using the composite Simpson's rule. Every pair
+    of neighbouring intervals is integrated exactly under a parabola through its three
+    points, which makes the rule exact for cubic polynomials on even spacing with an even
+    number of intervals. The points do not need to be evenly spaced. When the number of
+    intervals is odd, the last interval is integrated under the parabola through the last
+    three points, and the rule is then only exact for quadratic polynomials.
+
+    :param xs: List of x-coordinates representing the independent variable values. They
+        should be in ascending order and have at least three entries.
+    :type xs: list[float]
+    :param ys: List of y-coordinates representing the dependent variable values corresponding
+        to the x-coordinates. The length of this list must match the length of `xs`.
+    :type ys: list[float]
+    :return: The numerical approximation of the integral using Simpson's rule.
+    :rtype: float
+    :raises ValueError: If the lengths of `xs` and `ys` are different, or if fewer than three
+        points are provided in the input.
+    """
+    if len(xs) != len(ys):
+        raise ValueError("A different number of x and y values were given")
+    if len(xs) < 3:
+        raise ValueError("At least three points are required for Simpson's rule")
+
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    steps = np.diff(xs)
+
+    last = len(steps) - len(steps) % 2
+    h0 = steps[0:last:2]
+    h1 = steps[1:last:2]
+    y0 = ys[0:last:2]
+    y1 = ys[1:last + 1:2]
+    y2 = ys[2:last + 1:2]
+
+    integral = np.sum((h0 + h1) / 6 * ((2 - h1 / h0) * y0 + (h0 + h1) ** 2 / (h0 * h1) * y1 + (2 - h0 / h1) * y2))
+
+    if len(steps) % 2 == 1:
+        h0 = steps[-2]
+        h1 = steps[-1]
+        alpha = (2 * h1 ** 2 + 3 * h0 * h1) / (6 * (h0 + h1))
+        beta = (h1 ** 2 + 3 * h0 * h1) / (6 * h0)
+        eta = h1 ** 3 / (6 * h0 * (h0 + h1))
+        integral += alpha * ys[-1] + beta * ys[-2] - eta * ys[-3]
+
+    return float(integral)
+
+def romberg(function, start, end, tolerance=1e-8, max_levels=20):
+    """
+    Integrates a function over the interval [start, end] using Romberg's method. The
+    trapezoidal rule is refined by halving the step, and the results are improved by
+    Richardson extrapolation. Every level evaluates the function only at the midpoints
+    that are new at that level, so all previous evaluations are reused.
+
+    :param function: A callable evaluating the integrated function for an array of
+        x-values, such as a fitted interpolant.
+    :param start: Start of the integration interval.
+    :param end: End of the integration interval.
+    :param tolerance: Absolute error at which the refinement stops. Default is 1e-8.
+    :param max_levels: Maximum number of refinement levels. Default is 20.
+    :return: A tuple of the integral and the estimate of its absolute error, the
+        difference between the two last extrapolated values.
+    :rtype: tuple[float, float]
+    """
+    width = end - start
+    trapezoid = width * (function(np.asarray(start, dtype=float)) + function(np.asarray(end, dtype=float))) / 2
+    previous = [float(trapezoid)]
+    error = np.inf
+
+    for level in range(1, max_levels + 1):
+        step = width / 2 ** level
+        midpoints = start + step * (2 * np.arange(2 ** (level - 1)) + 1)
+        trapezoid = trapezoid / 2 + step * np.sum(function(midpoints))
+
+        current = [float(trapezoid)]
+        for k in range(1, level + 1):
+            current.append(current[k - 1] + (current[k - 1] - previous[k - 1]) / (4 ** k - 1))
+
+        error = abs(current[-1] - previous[-1])
+        previous = current
+        if error <= tolerance:
+            break
+
+    return previous[-1], error
+
+_KRONROD_NODES = np.array([
+    -0.991455371120812639206854697526329, -0.949107912342758524526189684047851,
+    -0.864864423359769072789712788640926, -0.741531185599394439863864773280788,
+    -0.586087235467691130294144845693013, -0.405845151377397166906606412076961,
+    -0.207784955007898467600689403773245, 0.000000000000000000000000000000000,
+    0.207784955007898467600689403773245, 0.405845151377397166906606412076961,
+    0.586087235467691130294144845693013, 0.741531185599394439863864773280788,
+    0.864864423359769072789712788640926, 0.949107912342758524526189684047851,
+    0.991455371120812639206854697526329,
+])
+_KRONROD_WEIGHTS = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+    0.204432940075298892414161999234649, 0.190350578064785409913256402421014,
+    0.169004726639267902826583426598550, 0.140653259715525918745189590510238,
+    0.104790010322250183839876322541518, 0.063092092629978553290700663189204,
+    0.022935322010529224963732008058970,
+])
+_GAUSS_WEIGHTS = np.array([
+    0, 0.129484966168869693270611432679082, 0, 0.279705391489276667901467771423780,
+    0, 0.381830050505118944950369775488975, 0, 0.417959183673469387755102040816327,
+    0, 0.381830050505118944950369775488975, 0, 0.279705391489276667901467771423780,
+    0, 0.129484966168869693270611432679082, 0,
+])
+
+def gauss_kronrod(function, start, end, tolerance=1e-8, max_depth=50):
+    """
+    Integrates a function over the interval [start, end] using adaptive Gauss-Kronrod
+    quadrature. Every interval is integrated with the 15-point Kronrod rule and the
+    difference to the embedded 7-point Gauss rule serves as its error estimate. Intervals
+    whose error exceeds their share of the tolerance are bisected, and all of them are
+    evaluated together in a single vectorized call of the function per round.
+
+    :param function: A callable evaluating the integrated function for an array of
+        x-values, such as a fitted interpolant.
+    :param start: Start of the integration interval.
+    :param end: End of the integration interval.
+    :param tolerance: Absolute error at which the refinement stops. Default is 1e-8.
+    :param max_depth: Maximum number of bisections of the initial interval. Default is 50.
+    :return: A tuple of the integral and the estimate of its absolute error.
+    :rtype: tuple[float, float]
+    """
+    starts = np.array([start], dtype=float)
+    ends = np.array([end], dtype=float)
+    width = abs(end - start)
+    if width == 0:
+        return 0.0, 0.0
+
+    integral = 0.0
+    error = 0.0
+
+    for depth in range(max_depth + 1):
+        centers = (starts + ends) / 2
+        radii = (ends - starts) / 2
+
+        values = function(centers[:, None] + radii[:, None] * _KRONROD_NODES)
+        kronrod = radii * (values @ _KRONROD_WEIGHTS)
+        errors = np.abs(kronrod - radii * (values @ _GAUSS_WEIGHTS))
+
+        # The share of an interval in the tolerance is compared without dividing by the width.
+        accepted = errors * width <= tolerance * np.abs(2 * radii)
+        if depth == max_depth:
+            accepted[:] = True
+
+        integral += np.sum(kronrod[accepted])
+        error += np.sum(errors[accepted])
+
+        starts = np.concatenate((starts[~accepted], centers[~accepted]))
+        ends = np.concatenate((centers[~accepted], ends[~accepted]))
+        if len(starts) == 0:
+            break
+
+    return float(integral), float(error)
\ No newline at end of file
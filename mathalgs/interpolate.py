@@ -1,7 +1,96 @@
 import mathalgs as ma
 import numpy as np
 
-def polynomial(xs, ys, interpolating_xs):
+class NewtonInterpolant:
+    """
+    Interpolating polynomial in Newton's form, fitted once and evaluated many times.
+
+    The divided differences are computed level by level in a single array, so the
+    fit takes O(n^2) time and O(n) memory. Only the top row of the divided-difference
+    table (the Newton coefficients) and its last diagonal are kept, the latter making
+    it possible to extend the polynomial with a new point in O(n).
+
+    Several series sharing the same x-coordinates can be interpolated at once by
+    passing a 2-D `ys` of shape `(series, n)`. The denominators of every level are
+    then shared by all series, and evaluation returns a `(series, m)` array.
+
+    :param xs: List of x-coordinates supplied for interpolation calculation
+    :param ys: List of y-coordinates corresponding to `xs`, or a 2-D array with
+        one series of y-coordinates per row
+    :param dtype: Floating-point type of the computation, float64 by default. float32
+        halves the memory traffic of memory-bound workloads at the cost of precision.
+    :raises ValueError: If the number of x and y values are different.
+    :raises ValueError: If no points are given.
+    """
+
+    def __init__(self, xs, ys, dtype=float):
+        if len(xs) != np.shape(ys)[-1]:
+            raise ValueError("A different number of x and y values were given")
+        if len(xs) == 0:
+            raise ValueError("At least one point is required for interpolation")
+
+        dtype = ma.buffers.floating(dtype)
+        self.xs = np.array(xs, dtype=dtype)
+        self.coefficients = np.array(ys, dtype=dtype)
+        self._diagonal = np.zeros(self.coefficients.shape, dtype=dtype)
+
+        self._diagonal[..., 0] = self.coefficients[..., -1]
+        for i in range(1, len(self.xs)):
+            self.coefficients[..., i:] = ((self.coefficients[..., i:] - self.coefficients[..., i - 1:-1])
+                                          / (self.xs[i:] - self.xs[:-i]))
+            self._diagonal[..., i] = self.coefficients[..., -1]
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __call__(self, interpolating_xs, out=None):
+        """
+        Evaluates the polynomial at the given x-coordinates using Horner's scheme.
+
+        :param interpolating_xs: List or array of x-coordinates where interpolated
+            y-values will be calculated
+        :param out: Optional array to store the result in, of the shape of the result.
+        :return: Array of interpolated y-values corresponding to `interpolating_xs`,
+            with a leading series axis when several series were fitted
+        """
+        interpolating_xs = np.asarray(interpolating_xs, dtype=self.coefficients.dtype)
+        points = interpolating_xs.ravel()
+
+        shape = self.coefficients.shape[:-1] + interpolating_xs.shape
+        result = ma.buffers.output(out, shape, self.coefficients.dtype)
+        interpolating_ys = result.reshape(self.coefficients.shape[:-1] + points.shape)
+
+        differences = np.empty_like(points)
+        interpolating_ys += self.coefficients[..., -1, None]
+        for i in range(len(self.xs) - 2, -1, -1):
+            interpolating_ys *= np.subtract(points, self.xs[i], out=differences)
+            interpolating_ys += self.coefficients[..., i, None]
+
+        return result
+
+    def add_point(self, x, y):
+        """
+        Extends the interpolating polynomial with one more point in O(n), without
+        recomputing the divided differences of the existing points.
+
+        :param x: x-coordinate of the new point, different from all existing ones.
+        :param y: y-coordinate of the new point, or one per series.
+        :return: The interpolant itself, to allow chaining.
+        """
+        length = len(self.xs)
+        self.xs = np.append(self.xs, x)
+
+        diagonal = np.zeros(self._diagonal.shape[:-1] + (length + 1,), dtype=self._diagonal.dtype)
+        diagonal[..., 0] = y
+        for i in range(1, length + 1):
+            diagonal[..., i] = (diagonal[..., i - 1] - self._diagonal[..., i - 1]) / (x - self.xs[length - i])
+
+        self.coefficients = np.concatenate((self.coefficients, diagonal[..., -1:]), axis=-1)
+        self._diagonal = diagonal
+
+        return self
+
+def polynomial(xs, ys, interpolating_xs, out=None, dtype=float):
     """
     Computes interpolated y-values for given x-values using Newton's
     divided differences polynomial interpolation.
@@ -10,106 +99,970 @@ def polynomial(xs, ys, interpolating_xs):
     divided differences method and evaluates the polynomial at the
     specified x-values for interpolation. It assumes that the input
     values `xs` and `ys` represent ordered sequential data and will
-    raise an error if their lengths differ.
+    raise an error if their lengths differ. When the same points are
+    evaluated repeatedly, use `NewtonInterpolant` to fit them only once,
+    or enable `cache` to reuse the fit across calls.
 
     :param xs: List of x-coordinates supplied for interpolation calculation
-    :param ys: List of y-coordinates corresponding to `xs`
+    :param ys: List of y-coordinates corresponding to `xs`, or a 2-D array of
+        shape `(series, n)` to interpolate several series at once
     :param interpolating_xs: List of x-coordinates where interpolated y-values
         will be calculated
-    :return: List of interpolated y-values corresponding to `interpolating_xs`
+    :param out: Optional array to store the result in, of the shape of the result.
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :return: List of interpolated y-values corresponding to `interpolating_xs`,
+        or a `(series, m)` array for a 2-D `ys`
     """
-    if len(xs) != len(ys):
-        raise ValueError("A different number of x and y values were given")
+    return ma.cache.fitted(NewtonInterpolant, xs, ys, dtype=dtype)(interpolating_xs, out=out)
 
-    length = len(xs)
-    differences = [[0 for _ in range(length)] for _ in range(length)]
-    differences[0][:length] = ys[:length]
+class BarycentricInterpolant:
+    """
+    Interpolating polynomial in the second (true) barycentric form of Lagrange's formula.
 
-    for i in range(1, length):
-        for j in range(length - i):
-            differences[i][j] = (differences[i - 1][j + 1] - differences[i - 1][j]) / (xs[j + i] - xs[j])
+    The barycentric weights depend only on the x-coordinates, so they are computed once
+    and every evaluation then costs O(n) per point. For arbitrary nodes the weights are
+    computed in O(n^2), for uniform and Chebyshev nodes they are given in closed form
+    and computed in O(n). The barycentric form is numerically stable, which makes it
+    better suited to high degrees than the Newton form.
 
-    interpolating_ys = np.zeros(len(interpolating_xs))
+    Several series sharing the same x-coordinates can be interpolated at once by
+    passing a 2-D `ys` of shape `(series, n)`, in which case the weights are shared
+    by all series and evaluation returns a `(series, m)` array.
 
-    for i in range(len(interpolating_xs)):
-        interpolating_ys[i] = differences[0][0]
-        mult = 1.0
-        for j in range(1, length):
-            mult *= (interpolating_xs[i] - xs[j - 1])
-            interpolating_ys[i] += differences[j][0] * mult
+    :param xs: List of distinct x-coordinates supplied for interpolation calculation
+    :param ys: List of y-coordinates corresponding to `xs`, or a 2-D array with
+        one series of y-coordinates per row
+    :param nodes: Distribution of `xs`, which selects how the weights are computed.
+        One of "arbitrary" (default), "uniform" for equally spaced nodes, "chebyshev"
+        for Chebyshev points of the second kind (including the endpoints) or
+        "chebyshev1" for Chebyshev points of the first kind, see `chebyshev_nodes`.
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :raises ValueError: If the number of x and y values are different.
+    :raises ValueError: If no points are given.
+    :raises ValueError: If the x values are not distinct.
+    :raises ValueError: If the node distribution is unknown.
+    :raises ValueError: If the x values don't have the given node distribution.
+    """
 
-    return interpolating_ys
+    def __init__(self, xs, ys, nodes="arbitrary", dtype=float):
+        if len(xs) != np.shape(ys)[-1]:
+            raise ValueError("A different number of x and y values were given")
+        if len(xs) == 0:
+            raise ValueError("At least one point is required for interpolation")
+
+        dtype = ma.buffers.floating(dtype)
+        self.xs = np.array(xs, dtype=dtype)
+        self.ys = np.array(ys, dtype=dtype)
+
+        length = len(self.xs)
+        indices = np.arange(length)
+        signs = np.where(indices % 2 == 0, 1.0, -1.0)
 
-def spline(xs, ys, interpolating_xs):
+        if len(np.unique(self.xs)) != length:
+            raise ValueError("Given x values are not distinct")
+
+        if nodes == "arbitrary":
+            self.weights = np.ones(length)
+            scale = 4 / (np.max(self.xs) - np.min(self.xs)) if length > 1 else 1
+            for i in range(length):
+                factors = (self.xs[i] - self.xs) * scale
+                factors[i] = 1
+                self.weights[i] = 1 / np.prod(factors)
+        elif nodes == "uniform":
+            _check_nodes(self.xs, np.linspace(0, 1, length), nodes)
+            log_binomials = np.concatenate(([0], np.cumsum(np.log((length - indices[1:]) / indices[1:]))))
+            self.weights = signs * np.exp(log_binomials - np.max(log_binomials))
+        elif nodes == "chebyshev":
+            _check_nodes(self.xs, chebyshev_nodes(0, 1, length, kind=2), nodes)
+            self.weights = signs
+            self.weights[[0, -1]] /= 2
+        elif nodes == "chebyshev1":
+            _check_nodes(self.xs, chebyshev_nodes(0, 1, length, kind=1), nodes)
+            self.weights = signs * np.sin((2 * indices + 1) * np.pi / (2 * length))
+        else:
+            raise ValueError(f"Unknown node distribution: {nodes}")
+
+        self.weights = self.weights.astype(dtype, copy=False)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __call__(self, interpolating_xs, out=None):
+        """
+        Evaluates the polynomial at the given x-coordinates. Points that coincide with
+        one of the nodes return the corresponding y-value exactly.
+
+        :param interpolating_xs: List or array of x-coordinates where interpolated
+            y-values will be calculated
+        :param out: Optional array to store the result in, of the shape of the result.
+        :return: Array of interpolated y-values corresponding to `interpolating_xs`,
+            with a leading series axis when several series were fitted
+        """
+        interpolating_xs = np.asarray(interpolating_xs, dtype=self.ys.dtype)
+        points = interpolating_xs.ravel()
+
+        result = ma.buffers.output(out, self.ys.shape[:-1] + interpolating_xs.shape, self.ys.dtype)
+        numerator = result.reshape(self.ys.shape[:-1] + points.shape)
+        denominator = np.zeros_like(points)
+        exact = np.full(points.shape, -1)
+
+        differences = np.empty_like(points)
+        terms = np.empty_like(points)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i in range(len(self.xs)):
+                np.subtract(points, self.xs[i], out=differences)
+                np.divide(self.weights[i], differences, out=terms)
+                numerator += terms * self.ys[..., i, None]
+                denominator += terms
+                exact[differences == 0] = i
+
+            numerator /= denominator
+
+        hits = exact >= 0
+        numerator[..., hits] = self.ys[..., exact[hits]]
+
+        return result
+
+def barycentric(xs, ys, interpolating_xs, nodes="arbitrary", out=None, dtype=float):
+    """
+    Computes interpolated y-values for given x-values using the barycentric form
+    of Lagrange polynomial interpolation.
+
+    This produces the same polynomial as `polynomial`, but is numerically stable at
+    high degrees. When the same points are evaluated repeatedly, use
+    `BarycentricInterpolant` to compute the weights only once, or enable `cache`
+    to reuse them across calls.
+
+    :param xs: List of distinct x-coordinates supplied for interpolation calculation
+    :param ys: List of y-coordinates corresponding to `xs`, or a 2-D array of
+        shape `(series, n)` to interpolate several series at once
+    :param interpolating_xs: List of x-coordinates where interpolated y-values
+        will be calculated
+    :param nodes: Distribution of `xs`, see `BarycentricInterpolant`.
+    :param out: Optional array to store the result in, of the shape of the result.
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :return: List of interpolated y-values corresponding to `interpolating_xs`,
+        or a `(series, m)` array for a 2-D `ys`
+    """
+    return ma.cache.fitted(BarycentricInterpolant, xs, ys, nodes=nodes, dtype=dtype)(interpolating_xs, out=out)
+
+def _check_nodes(xs, reference, nodes):
+    """
+    Checks that the x-coordinates are the reference nodes mapped onto the range between
+    the first and the last x-coordinate.
+
+    :param xs: Array of x-coordinates.
+    :param reference: Array of nodes of the distribution in ascending order.
+    :param nodes: Name of the distribution, used in the error message.
+    :raises ValueError: If the x-coordinates don't match the mapped reference nodes.
+    """
+    # Any one or two distinct points have every distribution.
+    if len(xs) <= 2:
+        return
+
+    span = xs[-1] - xs[0]
+    expected = xs[0] + (reference - reference[0]) / (reference[-1] - reference[0]) * span
+    if not np.allclose(xs, expected, rtol=0, atol=1e-6 * abs(span)):
+        raise ValueError(f"Given x values are not {nodes} nodes")
+
+def chebyshev_nodes(start, end, count, kind=2):
+    """
+    Generates Chebyshev points on the interval [start, end] in ascending order.
+
+    Points of the second kind are the extrema of the Chebyshev polynomial and include
+    both endpoints, points of the first kind are its roots and lie strictly inside.
+    Interpolating at these points avoids Runge's phenomenon.
+
+    :param start: Start of the interval.
+    :param end: End of the interval.
+    :param count: Number of points to generate.
+    :param kind: 1 or 2, the kind of Chebyshev points. Default is 2.
+    :return: Array of `count` Chebyshev points.
+    :raises ValueError: If the kind is neither 1 nor 2.
+    """
+    indices = np.arange(count)
+    if kind == 1:
+        angles = (2 * indices + 1) * np.pi / (2 * count)
+    elif kind == 2:
+        angles = indices * np.pi / max(count - 1, 1)
+    else:
+        raise ValueError("There are only first and second kind Chebyshev points")
+
+    return (start + end) / 2 - (end - start) / 2 * np.cos(angles)
+
+class SplineInterpolant:
+    """
+    Cubic B-spline interpolating evenly spaced points, fitted once and evaluated many times.
+
+    The B-spline coefficients are obtained from a tridiagonal system solved in O(n),
+    with the end derivatives estimated from the two outermost points on each side, and
+    every interpolating x-coordinate is evaluated only against the four basis functions
+    that are non-zero on its knot interval.
+
+    Several series sharing the same x-coordinates can be interpolated at once by passing
+    a 2-D `ys` of shape `(series, n)`. The system is then factorized a single time for
+    all series, and evaluation returns a `(series, m)` array.
+
+    :param xs: List or array of x-coordinates (evenly spaced), or a `Grid`.
+    :param ys: List or array of y-coordinates corresponding to `xs`, or a 2-D array
+        with one series of y-coordinates per row.
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :raises ValueError: If the number of x and y values are different.
+    :raises ValueError: If the x values are not equally spaced.
+    """
+
+    def __init__(self, xs, ys, dtype=float):
+        if len(xs) != np.shape(ys)[-1]:
+            raise ValueError("A different number of x and y values were given")
+
+        dtype = ma.buffers.floating(dtype)
+        self.diff = float(ma.grid.spacing(xs))
+        self.coefficients = _spline_fit(xs, ys, self.diff, dtype)
+        self.expanded_xs = _spline_knots(xs, self.diff, dtype)
+
+    def __call__(self, interpolating_xs, out=None):
+        """
+        Evaluates the spline at the given x-coordinates.
+
+        :param interpolating_xs: List or array of x-coordinates at which to interpolate.
+        :param out: Optional array to store the result in, of the shape of the result.
+        :return: Array of interpolated y-coordinates corresponding to `interpolating_xs`,
+            with a leading series axis when several series were fitted.
+        """
+        return _spline_evaluate(self.expanded_xs, self.coefficients, self.diff, interpolating_xs, out)
+
+    def roots(self, value=0.0):
+        """
+        Finds the x-coordinates where the spline equals a value, on every interval between
+        the interpolated points at once, from the cubic polynomial of the interval instead
+        of sampling the spline.
+
+        :param value: Value to find. Default is 0.
+        :return: Array of the x-coordinates in ascending order. When several series were
+            fitted, a tuple of an array of series indices and an array of x-coordinates,
+            ordered by series and x-coordinate.
+        """
+        series, locations = _spline_roots(self.expanded_xs[3], self.diff, self.coefficients, value)
+        return locations if np.ndim(self.coefficients) == 1 else (series, locations)
+
+    def extrema(self):
+        """
+        Finds the local extrema of the spline between the interpolated points, as the
+        roots of its quadratic derivative on every interval, computed in closed form.
+
+        :return: A tuple of an array of the x-coordinates of the extrema in ascending order
+            and a boolean array which is True for maxima and False for minima. When several
+            series were fitted, the tuple starts with an array of series indices.
+        """
+        series, locations, maxima = _spline_extrema(self.expanded_xs[3], self.diff, self.coefficients)
+        return (locations, maxima) if np.ndim(self.coefficients) == 1 else (series, locations, maxima)
+
+def spline(xs, ys, interpolating_xs, out=None, dtype=float):
     """
     Calculates spline interpolation for a given set of points and interpolates values
     for specified x-coordinates. This function implements a cubic B-spline interpolation
     method. It ensures that x values are evenly spaced and that the input x and y data
     have the same length.
 
-    :param xs: List or array of x-coordinates (evenly spaced).
-    :param ys: List or array of y-coordinates corresponding to `xs`.
+    The B-spline coefficients are obtained from a tridiagonal system solved in O(n),
+    and every interpolating x-coordinate is evaluated only against the four basis
+    functions that are non-zero on its knot interval. A 2-D `ys` of shape
+    `(series, n)` interpolates several series sharing the same `xs` at once, with
+    the system factorized a single time for all of them. When the same points are
+    evaluated repeatedly, use `SplineInterpolant` to fit them only once, or enable
+    `cache` to reuse the fit across calls.
+
+    :param xs: List or array of x-coordinates (evenly spaced), or a `Grid`.
+    :param ys: List or array of y-coordinates corresponding to `xs`, or a 2-D
+               array with one series of y-coordinates per row.
     :param interpolating_xs: List or array of x-coordinates at which to interpolate.
+    :param out: Optional array to store the result in, of the shape of the result.
+    :param dtype: Floating-point type of the computation, float64 by default.
     :return: List or array of interpolated y-coordinates corresponding to
-             `interpolating_xs`.
+             `interpolating_xs`, or a `(series, m)` array for a 2-D `ys`.
 
     :raises ValueError: If the number of x and y values are different.
     :raises ValueError: If the x values are not equally spaced.
     """
-    if len(xs) != len(ys):
-        raise ValueError("A different number of x and y values were given")
-    if ma.statistics.deviation(np.diff(xs)) > 0.001:
-        raise ValueError("Given x values are not equally spaced")
-
-    diff = ma.statistics.average(np.diff(xs))
-    length = len(xs) + 2
-
-    splines = np.zeros((length, length))
-    np.fill_diagonal(splines, 4)
-    np.fill_diagonal(splines[1:], 1)
-    np.fill_diagonal(splines[:, 1:], 1)
-
-    splines[0, 0] = -3 / diff
-    splines[0, 1] = 0
-    splines[0, 2] = 3 / diff
-    splines[-1, -3] = -3 / diff
-    splines[-1, -2] = 0
-    splines[-1, -1] = 3 / diff
-
-    expanded_ys = np.insert(ys, 0, ma.differentiation.differentiate(xs[:2], ys[:2], degree=1)[0])
-    expanded_ys = np.append(expanded_ys, ma.differentiation.differentiate(xs[-2:], ys[-2:], degree=1)[1])
-
-    coefficients = np.linalg.solve(splines, expanded_ys)
-
-    expanded_xs = np.copy(xs)
-    for i in range(3):
-        expanded_xs = np.insert(expanded_xs, 0, xs[0] - (i + 1) * diff)
-        expanded_xs = np.append(expanded_xs, xs[-1] + (i + 1) * diff)
-
-    def basis_value(index, x):
-        x0 = expanded_xs[index - 2]
-        x1 = expanded_xs[index - 1]
-        x2 = expanded_xs[index]
-        x3 = expanded_xs[index + 1]
-        x4 = expanded_xs[index + 2]
-
-        if x0 <= x < x1:
-            return ((x - x0) ** 3) / diff ** 3
-        elif x1 <= x < x2:
-            dx = x - x1
-            return (diff ** 3 + 3 * diff ** 2 * dx + 3 * diff * dx ** 2 - 3 * dx ** 3) / diff ** 3
-        elif x2 <= x < x3:
-            dx = x3 - x
-            return (diff ** 3 + 3 * diff ** 2 * dx + 3 * diff * dx ** 2 - 3 * dx ** 3) / diff ** 3
-        elif x3 <= x <= x4:
-            return ((x4 - x) ** 3) / diff ** 3
-        else:
-            return 0
+    return ma.cache.fitted(SplineInterpolant, xs, ys, dtype=dtype)(interpolating_xs, out=out)
+
+class StreamingSpline:
+    """
+    Cubic B-spline interpolating a stream of evenly spaced samples over a sliding window,
+    updated incrementally as samples are appended and old ones are dropped.
+
+    The spline is the one of `SplineInterpolant`, with the end derivatives estimated from
+    the two outermost samples on each side. A change at one end of the tridiagonal system
+    decays by a factor of about 0.27 per knot towards the other end, so an update only
+    recomputes the `span` coefficients next to the changed end, with the coefficient just
+    beyond them kept fixed. With the default span, the difference to fitting the whole
+    window again is far below the rounding error, while every update costs O(span) plus
+    the number of appended samples, independently of the window length.
+
+    :param step: Spacing between consecutive samples.
+    :param start: x-coordinate of the first sample. Default is 0.
+    :param window: Maximum number of samples kept. When exceeded, the oldest samples are
+        dropped. By default, all samples are kept.
+    :param span: Number of coefficients recomputed next to a changed end, at least 2.
+        Default is 32.
+    :param dtype: Floating-point type of the samples and coefficients, float64 by default.
+    :raises ValueError: If the step is not positive.
+    :raises ValueError: If the span is less than 2.
+    """
+
+    def __init__(self, step, start=0.0, window=None, span=32, dtype=float):
+        if step <= 0:
+            raise ValueError("Step between samples has to be positive")
+        if span < 2:
+            raise ValueError("At least two coefficients have to be recomputed")
+
+        self.step = step
+        self.window = window
+        self.span = span
+        self._origin = start
+        self._dropped = 0
+        self._first = 0
+        self._length = 0
+        self._ys = np.zeros(2 * window if window else 64, dtype=ma.buffers.floating(dtype))
+        self._coefficients = np.zeros(len(self._ys) + 2, dtype=self._ys.dtype)
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def start(self):
+        """
+        x-coordinate of the first sample in the window.
+        """
+        return self._origin + self._dropped * self.step
+
+    @property
+    def xs(self):
+        """
+        Array of the x-coordinates of the samples in the window.
+        """
+        return self.start + np.arange(self._length) * self.step
+
+    @property
+    def ys(self):
+        """
+        Array of the samples in the window.
+        """
+        return self._ys[self._first:self._first + self._length]
+
+    @property
+    def coefficients(self):
+        """
+        Array of the `len(self) + 2` B-spline coefficients of the window.
+        """
+        return self._coefficients[self._first:self._first + self._length + 2]
+
+    def append(self, samples):
+        """
+        Appends new samples to the end of the window, dropping the oldest samples if the
+        window gets longer than its maximum length.
+
+        :param samples: A sample or a list or array of consecutive samples.
+        :return: The spline itself, to allow chaining.
+        """
+        samples = np.atleast_1d(np.asarray(samples, dtype=self._ys.dtype))
+        count = len(samples)
+        if self.window is not None and count >= self.window:
+            # The whole window is replaced, which needs a full fit anyway.
+            self._dropped += self._length + count - self.window
+            self._first = 0
+            self._length = self.window
+            self._ys[:self.window] = samples[count - self.window:]
+            self._fit()
+            return self
+
+        self._reserve(self._length + count)
+        end = self._first + self._length
+        self._ys[end:end + count] = samples
+        self._length += count
+        self._refit_end(count)
+
+        if self.window is not None and self._length > self.window:
+            self.drop(self._length - self.window)
+
+        return self
+
+    def drop(self, count):
+        """
+        Drops the oldest samples from the start of the window.
+
+        :param count: Number of samples to drop.
+        :return: The spline itself, to allow chaining.
+        """
+        count = min(count, self._length)
+        self._first += count
+        self._length -= count
+        self._dropped += count
+        self._refit_start()
+
+        return self
+
+    def __call__(self, interpolating_xs, out=None):
+        """
+        Evaluates the spline of the current window at the given x-coordinates.
+
+        :param interpolating_xs: List or array of x-coordinates at which to interpolate.
+        :param out: Optional array to store the result in, of the shape of the result.
+        :return: Array of interpolated y-coordinates corresponding to `interpolating_xs`.
+        :raises ValueError: If the window holds fewer than two samples.
+        """
+        if self._length < 2:
+            raise ValueError("At least two samples are required for interpolation")
+
+        expanded_xs = _spline_knots(self.xs, self.step, self._ys.dtype)
+        return _spline_evaluate(expanded_xs, self.coefficients, self.step, interpolating_xs, out)
+
+    def roots(self, value=0.0):
+        """
+        Finds the x-coordinates where the spline of the current window equals a value, on
+        every interval between the samples at once, from the cubic polynomial of the
+        interval instead of sampling the spline.
+
+        :param value: Value to find. Default is 0.
+        :return: Array of the x-coordinates in ascending order.
+        :raises ValueError: If the window holds fewer than two samples.
+        """
+        if self._length < 2:
+            raise ValueError("At least two samples are required for interpolation")
+
+        return _spline_roots(self.start, self.step, self.coefficients, value)[1]
+
+    def extrema(self):
+        """
+        Finds the local extrema of the spline of the current window, as the roots of its
+        quadratic derivative on every interval, computed in closed form.
+
+        :return: A tuple of an array of the x-coordinates of the extrema in ascending order
+            and a boolean array which is True for maxima and False for minima.
+        :raises ValueError: If the window holds fewer than two samples.
+        """
+        if self._length < 2:
+            raise ValueError("At least two samples are required for interpolation")
+
+        return _spline_extrema(self.start, self.step, self.coefficients)[1:]
+
+    def _reserve(self, length):
+        if self._first + length <= len(self._ys):
+            return
+
+        capacity = max(len(self._ys), 2 * length)
+        ys = np.zeros(capacity, dtype=self._ys.dtype)
+        coefficients = np.zeros(capacity + 2, dtype=self._ys.dtype)
+        ys[:self._length] = self.ys
+        coefficients[:self._length + 2] = self.coefficients
+
+        self._ys = ys
+        self._coefficients = coefficients
+        self._first = 0
+
+    def _derivative(self, ys):
+        return ma.differentiation.differentiate(self.step * np.arange(2), ys, step=self.step, dtype=ys.dtype)
+
+    def _fit(self):
+        if self._length < 2:
+            return
+
+        ys = self.ys
+        first_derivative = self._derivative(ys[:2])[0]
+        last_derivative = self._derivative(ys[-2:])[1]
+        self.coefficients[:] = _spline_coefficients(ys, first_derivative, last_derivative, self.step)
+
+    def _refit_end(self, count):
+        length = self._length
+        first = length - count - self.span
+        if first <= 1:
+            self._fit()
+            return
+
+        ys = self.ys
+        coefficients = self.coefficients
+        last_derivative = self._derivative(ys[-2:])[1]
+
+        rhs = np.array(ys[first - 1:])
+        rhs[0] -= coefficients[first - 1]
+        rhs[-1] -= last_derivative * self.step / 3
+
+        lower = np.ones(len(rhs) - 1)
+        lower[-1] = 2
+        coefficients[first:length + 1] = _solve_tridiagonal(lower, np.full(len(rhs), 4.0), np.ones(len(rhs) - 1), rhs)
+        coefficients[length + 1] = coefficients[length - 1] + last_derivative * self.step / 3
+
+    def _refit_start(self):
+        last = self.span
+        if last + 2 >= self._length:
+            self._fit()
+            return
+
+        ys = self.ys
+        coefficients = self.coefficients
+        first_derivative = self._derivative(ys[:2])[0]
+
+        rhs = np.array(ys[:last])
+        rhs[0] += first_derivative * self.step / 3
+        rhs[-1] -= coefficients[last + 1]
+
+        upper = np.ones(last - 1)
+        upper[0] = 2
+        coefficients[1:last + 1] = _solve_tridiagonal(np.ones(last - 1), np.full(last, 4.0), upper, rhs)
+        coefficients[0] = coefficients[2] - first_derivative * self.step / 3
+
+class BicubicSpline:
+    """
+    Bicubic tensor-product B-spline interpolating values given on a regular 2-D grid,
+    such as `f(x,y)` for every combination of evenly spaced x and y values.
+
+    The surface is the sum of products of the uniform cubic B-spline bases of `spline`
+    along both axes. It is fitted with separable 1-D solves: every row of values is first
+    fitted along the x axis, with all rows solved together, and the resulting coefficients
+    are then fitted along the y axis. Scattered points are evaluated against the sixteen
+    products of basis functions that are non-zero around them, all points at once.
+
+    :param xs: List or array of x-coordinates of the grid (evenly spaced), or a `Grid`.
+    :param ys: List or array of y-coordinates of the grid (evenly spaced), or a `Grid`.
+    :param zs: 2-D array of values, with `zs[j][i]` given at `(xs[i], ys[j])`.
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :raises ValueError: If the shape of zs doesn't match the number of x and y values.
+    :raises ValueError: If the x or y values are not equally spaced.
+    """
+
+    def __init__(self, xs, ys, zs, dtype=float):
+        dtype = ma.buffers.floating(dtype)
+        zs = np.asarray(zs, dtype=dtype)
+        if zs.shape != (len(ys), len(xs)):
+            raise ValueError("A different number of x, y and z values were given")
+        try:
+            self.x_diff = float(ma.grid.spacing(xs))
+            self.y_diff = float(ma.grid.spacing(ys))
+        except ValueError:
+            raise ValueError("Given x or y values are not equally spaced") from None
+
+        self.expanded_xs = _spline_knots(xs, self.x_diff, dtype)
+        self.expanded_ys = _spline_knots(ys, self.y_diff, dtype)
+
+        rows = _spline_fit(xs, zs, self.x_diff, dtype)
+        self.coefficients = _spline_fit(ys, rows.T, self.y_diff, dtype).T
+        self._padded = np.pad(self.coefficients, 3)
+
+    def __call__(self, interpolating_xs, interpolating_ys, out=None):
+        """
+        Evaluates the surface at scattered points. Points outside of the expanded knots
+        along either axis evaluate to zero.
+
+        :param interpolating_xs: x-coordinates of the points.
+        :param interpolating_ys: y-coordinates of the points, broadcast against
+            `interpolating_xs`.
+        :param out: Optional array to store the result in, of the shape of the result.
+        :return: Array of interpolated values in the broadcast shape of the coordinates.
+        """
+        interpolating_xs, interpolating_ys = np.broadcast_arrays(
+            np.asarray(interpolating_xs, dtype=self.coefficients.dtype),
+            np.asarray(interpolating_ys, dtype=self.coefficients.dtype),
+        )
+
+        x_intervals, x_basis = _spline_basis(self.expanded_xs, self.x_diff, interpolating_xs)
+        y_intervals, y_basis = _spline_basis(self.expanded_ys, self.y_diff, interpolating_ys)
+
+        interpolating_zs = ma.buffers.output(out, interpolating_xs.shape, self.coefficients.dtype)
+        terms = np.empty_like(interpolating_zs)
+        for j in range(4):
+            for i in range(4):
+                np.multiply(y_basis[j], x_basis[i], out=terms)
+                terms *= self._padded[y_intervals + j, x_intervals + i]
+                interpolating_zs += terms
+
+        return interpolating_zs
+
+def bicubic(xs, ys, zs, interpolating_xs, interpolating_ys, out=None, dtype=float):
+    """
+    Calculates bicubic spline interpolation of values given on a regular 2-D grid at
+    scattered points. When the same grid is evaluated repeatedly, use `BicubicSpline`
+    to fit it only once.
+
+    :param xs: List or array of x-coordinates of the grid (evenly spaced), or a `Grid`.
+    :param ys: List or array of y-coordinates of the grid (evenly spaced), or a `Grid`.
+    :param zs: 2-D array of values, with `zs[j][i]` given at `(xs[i], ys[j])`.
+    :param interpolating_xs: x-coordinates of the points at which to interpolate.
+    :param interpolating_ys: y-coordinates of the points at which to interpolate.
+    :param out: Optional array to store the result in, of the shape of the result.
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :return: Array of interpolated values in the broadcast shape of the coordinates.
+    """
+    return BicubicSpline(xs, ys, zs, dtype=dtype)(interpolating_xs, interpolating_ys, out=out)
+
+def _solve_tridiagonal(lower, diagonal, upper, rhs):
+    """
+    Solves a tridiagonal system of linear equations using the Thomas algorithm.
+
+    The system is given by its three diagonals and is solved in O(n) time and memory.
+    It is meant for diagonally dominant systems, for which no pivoting is required.
+
+    :param lower: Sub-diagonal of the matrix, of length n - 1.
+    :param diagonal: Main diagonal of the matrix, of length n.
+    :param upper: Super-diagonal of the matrix, of length n - 1.
+    :param rhs: Right-hand side of the system, of length n along the first axis.
+        Further axes hold independent right-hand sides, which are solved together.
+    :return: Array with the solution of the system, shaped like `rhs`.
+    """
+    length = len(diagonal)
+    upper_prime = np.zeros(length)
+    solution = np.array(rhs, dtype=np.result_type(rhs, np.float32))
+
+    denominator = diagonal[0]
+    solution[0] = solution[0] / denominator
+    for i in range(1, length):
+        upper_prime[i - 1] = upper[i - 1] / denominator
+        denominator = diagonal[i] - lower[i - 1] * upper_prime[i - 1]
+        solution[i] = (solution[i] - lower[i - 1] * solution[i - 1]) / denominator
+
+    for i in range(length - 2, -1, -1):
+        solution[i] -= upper_prime[i] * solution[i + 1]
+
+    return solution
+
+def _spline_knots(xs, diff, dtype=float):
+    """
+    Extends the knots of a uniform cubic B-spline by three knots on each side.
+
+    :param xs: Sequence of evenly spaced knots.
+    :param diff: Spacing between the knots.
+    :param dtype: Data type of the knots. Default is float64.
+    :return: Array of `len(xs) + 6` knots.
+    """
+    return np.concatenate((
+        xs[0] - np.arange(3, 0, -1) * diff,
+        xs,
+        xs[-1] + np.arange(1, 4) * diff,
+    ), dtype=dtype)
+
+def _spline_fit(xs, ys, diff, dtype=float):
+    """
+    Computes the coefficients of the cubic B-spline interpolating `ys`, with the end
+    derivatives estimated from the two outermost points on each side.
+
+    :param xs: Sequence of evenly spaced knots.
+    :param ys: Sequence of y-coordinates at the knots, or a 2-D array with one series per row.
+    :param diff: Spacing between the knots.
+    :param dtype: Floating-point type of the computation. Default is float64.
+    :return: Array of `n + 2` B-spline coefficients along the last axis.
+    """
+    ys = np.asarray(ys, dtype=dtype)
+    first_derivative = ma.differentiation.differentiate(xs[:2], ys[..., :2], degree=1, dtype=dtype)[..., 0]
+    last_derivative = ma.differentiation.differentiate(xs[-2:], ys[..., -2:], degree=1, dtype=dtype)[..., 1]
+
+    return _spline_coefficients(ys, first_derivative, last_derivative, diff)
+
+def _spline_coefficients(ys, first_derivative, last_derivative, diff):
+    """
+    Computes the coefficients of the cubic B-spline interpolating `ys` on evenly spaced
+    knots, with the first derivative prescribed at both ends.
+
+    The full system consists of the rows `c[i] + 4 * c[i + 1] + c[i + 2] = ys[i]` and two
+    boundary rows `3 / diff * (c[2] - c[0])` and `3 / diff * (c[-1] - c[-3])` equal to the
+    end derivatives. The boundary rows are eliminated, which leaves a diagonally dominant
+    tridiagonal system for the inner coefficients.
+
+    :param ys: Sequence of y-coordinates at the knots, or a 2-D array with one series
+        per row, all of which are solved with a single factorization.
+    :param first_derivative: Derivative prescribed at the first knot, one per series.
+    :param last_derivative: Derivative prescribed at the last knot, one per series.
+    :param diff: Spacing between the knots.
+    :return: Array of `n + 2` B-spline coefficients along the last axis.
+    """
+    ys = np.asarray(ys)
+    length = ys.shape[-1]
+
+    diagonal = np.full(length, 4.0)
+    lower = np.ones(length - 1)
+    upper = np.ones(length - 1)
+    upper[0] = 2
+    lower[-1] = 2
+
+    rhs = np.array(ys.T, dtype=np.result_type(ys, np.float32))
+    rhs[0] += first_derivative * diff / 3
+    rhs[-1] -= last_derivative * diff / 3
+
+    coefficients = np.zeros((length + 2,) + rhs.shape[1:], dtype=rhs.dtype)
+    coefficients[1:-1] = _solve_tridiagonal(lower, diagonal, upper, rhs)
+    coefficients[0] = coefficients[2] - first_derivative * diff / 3
+    coefficients[-1] = coefficients[-3] + last_derivative * diff / 3
+
+    return coefficients.T
+
+def _spline_basis(expanded_xs, diff, interpolating_xs):
+    """
+    Evaluates the four uniform cubic B-spline basis functions that are non-zero on the
+    knot interval of every given x-coordinate.
+
+    The knot interval is located with a binary search. The basis function values are
+    ordered by increasing coefficient index, so that the `k`-th one belongs to the
+    coefficient `intervals + k - 3`. Points outside of the expanded knots get zero
+    basis values.
+
+    :param expanded_xs: Knots of the spline, extended by three knots on each side.
+    :param diff: Spacing between the knots.
+    :param interpolating_xs: x-coordinates at which the basis is evaluated.
+    :return: A tuple of the knot intervals and a `(4, m)` array of basis values.
+    """
+    interpolating_xs = np.asarray(interpolating_xs, dtype=expanded_xs.dtype)
+
+    intervals = np.searchsorted(expanded_xs, interpolating_xs, side="right") - 1
+    inside = (intervals >= 0) & (intervals < len(expanded_xs) - 1)
+    intervals = np.clip(intervals, 0, len(expanded_xs) - 2)
+
+    rising = interpolating_xs - expanded_xs[intervals]
+    falling = expanded_xs[intervals + 1] - interpolating_xs
+
+    def middle(dx):
+        return (diff ** 3 + 3 * diff ** 2 * dx + 3 * diff * dx ** 2 - 3 * dx ** 3) / diff ** 3
+
+    basis = np.array([falling ** 3 / diff ** 3, middle(falling), middle(rising), rising ** 3 / diff ** 3])
+    basis[:, ~inside] = 0
+
+    return intervals, basis
+
+def _spline_evaluate(expanded_xs, coefficients, diff, interpolating_xs, out=None):
+    """
+    Evaluates a uniform cubic B-spline at the given x-coordinates.
+
+    Only the four basis functions that are non-zero on the knot interval of every
+    x-coordinate are evaluated, see `_spline_basis`. The terms are summed in the order
+    of increasing coefficient index. Points outside of the expanded knots evaluate
+    to zero.
+
+    :param expanded_xs: Knots of the spline, extended by three knots on each side.
+    :param coefficients: B-spline coefficients, one per basis function along the last
+        axis. Leading axes hold independent series.
+    :param diff: Spacing between the knots.
+    :param interpolating_xs: x-coordinates at which the spline is evaluated.
+    :param out: Optional array to store the result in, of the shape of the result.
+    :return: Array of spline values at `interpolating_xs`, with the leading axes of
+        `coefficients`.
+    """
+    intervals, basis = _spline_basis(expanded_xs, diff, interpolating_xs)
+
+    padding = np.zeros(np.shape(coefficients)[:-1] + (3,), dtype=coefficients.dtype)
+    padded = np.concatenate((padding, coefficients, padding), axis=-1)
+
+    interpolating_ys = ma.buffers.output(out, padded.shape[:-1] + intervals.shape, padded.dtype)
+    # The coefficients are gathered in their own type, which `out` may be wider than.
+    terms = np.empty(interpolating_ys.shape, dtype=padded.dtype)
+    for k in range(4):
+        np.take(padded, intervals + k, axis=-1, out=terms)
+        terms *= basis[k]
+        interpolating_ys += terms
+
+    return interpolating_ys
+
+def _spline_segments(coefficients):
+    """
+    Converts the coefficients of a uniform cubic B-spline to the power basis of every
+    interval between the interpolated knots, in the local coordinate `t` running from 0
+    at the start to 1 at the end of the interval.
+
+    :param coefficients: Array of `n + 2` B-spline coefficients along the last axis.
+    :return: Array of shape `(..., n - 1, 4)` with the coefficients of `1, t, t^2, t^3`.
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    p0 = coefficients[..., :-3]
+    p1 = coefficients[..., 1:-2]
+    p2 = coefficients[..., 2:-1]
+    p3 = coefficients[..., 3:]
+
+    return np.stack((p0 + 4 * p1 + p2, 3 * (p2 - p0), 3 * (p0 - 2 * p1 + p2), p3 - p0 + 3 * (p1 - p2)), axis=-1)
+
+def _quadratic_roots(a, b, c):
+    """
+    Finds the simple real roots of many quadratics `a t^2 + b t + c` at once, using the
+    numerically stable form of the quadratic formula. A quadratic with `a = 0` is solved
+    as a linear equation.
+
+    :return: Array of shape `(..., 2)` with the roots in ascending order, NaN where
+        a quadratic has fewer than two simple real roots.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discriminant = b ** 2 - 4 * a * c
+        q = -(b + np.copysign(np.sqrt(np.where(discriminant > 0, discriminant, np.nan)), b)) / 2
+        roots = np.stack((q / a, c / q), axis=-1)
+
+        linear = (a == 0) & (b != 0)
+        roots[linear, 0] = -c[linear] / b[linear]
+        roots[linear, 1] = np.nan
+
+    return np.sort(roots, axis=-1)
+
+def _rounding(coefficients):
+    """
+    :return: Machine epsilon of the floating-point type of the coefficients, float64 for
+        other types.
+    """
+    dtype = np.asarray(coefficients).dtype
+    return np.finfo(dtype if np.issubdtype(dtype, np.floating) else float).eps
+
+def _spline_knot_values(coefficients, eps):
+    """
+    Computes the value, the first and the second derivative of a uniform cubic B-spline
+    at every interpolated knot, in the local coordinate of the intervals, once per knot so
+    that both neighbouring intervals share them. Every quantity is returned with a bound
+    of its rounding error, below which it can't be told apart from zero.
+
+    :param coefficients: Array of `n + 2` B-spline coefficients along the last axis.
+    :param eps: Machine epsilon of the type the coefficients were computed in.
+    :return: A tuple of pairs of arrays of shape `(..., n)`, the quantity and its bound,
+        for the value, the first and the second derivative.
+    """
+    p0 = coefficients[..., :-2]
+    p1 = coefficients[..., 1:-1]
+    p2 = coefficients[..., 2:]
+    noise = 8 * eps
+
+    values = (p0 + 4 * p1 + p2, noise * (np.abs(p0) + 4 * np.abs(p1) + np.abs(p2)))
+    slopes = (3 * (p2 - p0), noise * 3 * (np.abs(p0) + np.abs(p2)))
+    curvatures = (6 * (p0 - 2 * p1 + p2), noise * 6 * (np.abs(p0) + 2 * np.abs(p1) + np.abs(p2)))
+
+    return values, slopes, curvatures
+
+def _spline_critical(segments, tolerance):
+    """
+    Finds the simple roots of the derivative of every interval strictly inside it. Roots
+    within the tolerance of either end are left out, as they lie on a knot, which is
+    handled once for both of its intervals.
+
+    :param segments: Array of shape `(intervals, 4)` with the power basis of every interval.
+    :param tolerance: Distance from an end, in the local coordinate, within which a root
+        lies on the knot.
+    :return: A tuple of the array of shape `(intervals, 2)` with the roots, NaN where there
+        is none, and of a boolean array of the same shape which is True for the roots left
+        out at the start (first column) or the end (second column) of an interval.
+    """
+    critical = _quadratic_roots(3 * segments[:, 3], 2 * segments[:, 2], segments[:, 1])
+    starting = np.abs(critical) <= tolerance
+    ending = np.abs(critical - 1) <= tolerance
+    critical[~((critical > tolerance) & (critical < 1 - tolerance))] = np.nan
+
+    return critical, np.stack((np.any(starting, axis=-1), np.any(ending, axis=-1)), axis=-1)
+
+def _spline_roots(start, diff, coefficients, value=0.0):
+    """
+    Finds all x-coordinates where a uniform cubic B-spline equals `value`, between its
+    first and last interpolated knot.
+
+    The value at every knot is computed once and shared by both of its intervals, and
+    it counts as a root when it is zero up to its rounding error. Every interval is then
+    split at the roots of the derivative into monotonic pieces, which contain at most one
+    root each. The pieces of all intervals and series that change sign strictly inside
+    are bisected together down to the resolution of floating-point numbers.
+
+    :param start: First interpolated knot.
+    :param diff: Spacing between the knots.
+    :param coefficients: Array of B-spline coefficients along the last axis, leading
+        axes hold independent series.
+    :param value: Value to find.
+    :return: A tuple of the flat series indices and the x-coordinates of the roots,
+        ordered by series and x-coordinate.
+    """
+    eps = _rounding(coefficients)
+    coefficients = np.asarray(coefficients, dtype=float)
+    (knots, bounds), _, _ = _spline_knot_values(coefficients, eps)
+    knots = knots - value
+    knot_zero = np.abs(knots) <= bounds + 8 * eps * abs(value)
+    knots[knot_zero] = 0
+    knots = knots.reshape(-1, knots.shape[-1])
+    count = knots.shape[-1]
+
+    segments = _spline_segments(coefficients).reshape(-1, 4)
+    segments[:, 0] -= value
+    critical, _ = _spline_critical(segments, np.sqrt(eps))
+    critical = np.sort(np.where(np.isnan(critical), 1, critical), axis=-1)
+
+    def evaluate(index, t):
+        return ((segments[index, 3] * t + segments[index, 2]) * t + segments[index, 1]) * t + segments[index, 0]
+
+    # The pieces of an interval run between its knots and the roots of the derivative inside it.
+    intervals = len(segments)
+    index = np.repeat(np.arange(intervals), 3)
+    series, interval = np.divmod(index, count - 1)
+    breaks = np.concatenate((np.zeros((intervals, 1)), critical, np.ones((intervals, 1))), axis=-1)
+
+    inner_values = evaluate(np.arange(intervals)[:, None], critical)
+    inner_zero = np.abs(inner_values) <= 8 * eps * np.max(np.abs(segments), axis=-1, keepdims=True)
+    inner_zero &= critical < 1
+    inner_values[inner_zero] = 0
+
+    knot_values = knots[:, :-1].ravel(), knots[:, 1:].ravel()
+    break_values = np.column_stack((knot_values[0], np.where(critical < 1, inner_values, knot_values[1][:, None]), knot_values[1]))
+
+    low, high = breaks[:, :-1].ravel(), breaks[:, 1:].ravel()
+    low_values, high_values = break_values[:, :-1].ravel(), break_values[:, 1:].ravel()
+
+    bracketed = (np.sign(low_values) * np.sign(high_values) < 0) & (low < high)
+    lower, upper, sign = low[bracketed], high[bracketed], np.sign(low_values[bracketed])
+    for _ in range(64):
+        middle = (lower + upper) / 2
+        same = np.sign(evaluate(index[bracketed], middle)) == sign
+        lower = np.where(same, middle, lower)
+        upper = np.where(same, upper, middle)
+
+    # Knots and touching roots of the derivative are roots on their own, counted once.
+    knot_series, knot_positions = np.nonzero(knots == 0)
+    touching = np.flatnonzero(inner_zero.ravel())
+    touching_series, touching_intervals = np.divmod(touching // 2, count - 1)
+
+    series = np.concatenate((knot_series, touching_series, series[bracketed]))
+    positions = np.concatenate((knot_positions, touching_intervals + critical.ravel()[touching],
+                                interval[bracketed] + (lower + upper) / 2))
+    order = np.lexsort((positions, series))
+
+    return series[order], start + positions[order] * diff
+
+def _spline_extrema(start, diff, coefficients):
+    """
+    Finds all local extrema of a uniform cubic B-spline between its first and last
+    interpolated knot, as the simple roots of the quadratic derivative on every interval
+    and the knots where the derivative is zero.
+
+    The derivative and the curvature at every knot are computed once and shared by both
+    of its intervals. A knot is an extremum when its derivative is zero up to its rounding
+    error, or when a root of the derivative of one of its intervals lies within a small
+    tolerance of it, and its curvature is not zero.
+
+    :param start: First interpolated knot.
+    :param diff: Spacing between the knots.
+    :param coefficients: Array of B-spline coefficients along the last axis, leading
+        axes hold independent series.
+    :return: A tuple of the flat series indices, the x-coordinates of the extrema and
+        a boolean array which is True for maxima and False for minima, ordered by
+        series and x-coordinate.
+    """
+    eps = _rounding(coefficients)
+    coefficients = np.asarray(coefficients, dtype=float)
+    _, (slopes, slope_bounds), (curvatures, curvature_bounds) = _spline_knot_values(coefficients, eps)
+    count = slopes.shape[-1]
+    slopes, slope_bounds = slopes.reshape(-1, count), slope_bounds.reshape(-1, count)
+    curvatures, curvature_bounds = curvatures.reshape(-1, count), curvature_bounds.reshape(-1, count)
+
+    segments = _spline_segments(coefficients).reshape(-1, 4)
+    critical, snapped = _spline_critical(segments, np.sqrt(eps))
+    curvature = 2 * segments[:, 2, None] + 6 * segments[:, 3, None] * critical
+
+    # Roots of the derivative next to a knot are snapped onto it, and every knot is taken once.
+    knot_extrema = np.abs(slopes) <= slope_bounds
+    snapped_series, snapped_intervals = np.divmod(np.arange(len(segments)), count - 1)
+    knot_extrema[snapped_series[snapped[:, 0]], snapped_intervals[snapped[:, 0]]] = True
+    knot_extrema[snapped_series[snapped[:, 1]], snapped_intervals[snapped[:, 1]] + 1] = True
+    knot_extrema &= np.abs(curvatures) > curvature_bounds
+    knot_series, knot_positions = np.nonzero(knot_extrema)
 
-    interpolating_ys = np.zeros(len(interpolating_xs))
+    inner = np.flatnonzero((~np.isnan(critical) & (curvature != 0)).ravel())
+    inner_series, inner_intervals = np.divmod(inner // 2, count - 1)
 
-    for i in range(len(interpolating_xs)):
-        for j in range(len(coefficients)):
-            interpolating_ys[i] += coefficients[j] * basis_value(j + 2, interpolating_xs[i])
+    series = np.concatenate((knot_series, inner_series))
+    positions = np.concatenate((knot_positions, inner_intervals + critical.ravel()[inner]))
+    maxima = np.concatenate((curvatures[knot_series, knot_positions] < 0, curvature.ravel()[inner] < 0))
+    order = np.lexsort((positions, series))
 
-    return interpolating_ys
\ No newline at end of file
+    return series[order], start + positions[order] * diff, maxima[order]
\ No newline at end of file
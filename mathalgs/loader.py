@@ -0,0 +1,155 @@
+import itertools
+import json
+import os
+import numpy as np
+
+_CACHE_VERSION = 1
+
+class Table:
+    """
+    Columns of a whitespace-delimited data file, memory-mapped from its binary cache.
+
+    Every column is a read-only NumPy array backed by the cache file, so columns and
+    slices of them are views which don't copy the data into memory. Tables are created
+    with `load`.
+
+    :param directory: Directory of the binary cache.
+    :param manifest: Description of the cache, as stored in its manifest.
+    """
+
+    def __init__(self, directory, manifest):
+        self.columns = manifest["columns"]
+        self._data = dict()
+
+        for index, column in enumerate(self.columns):
+            if manifest["rows"] == 0:
+                self._data[column] = np.zeros(0)
+            else:
+                path = os.path.join(directory, f"{index}.f8")
+                self._data[column] = np.memmap(path, dtype="<f8", mode="r", shape=(manifest["rows"],))
+
+    def __len__(self):
+        return len(self._data[self.columns[0]])
+
+    def __getitem__(self, column):
+        return self._data[column]
+
+    def slices(self, key):
+        """
+        Splits the table into slices of consecutive rows with the same value of the key
+        column, such as the `x` and `f(x,y)` values for every `y`. The rows have to be
+        grouped by the key, so that every slice is a view of the columns.
+
+        :param key: Name of the key column.
+        :return: A list of tuples of the key value and a dictionary of column views.
+        :raises ValueError: If the rows are not grouped by the key column.
+        """
+        keys = self[key]
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        if len(np.unique(keys[starts])) != len(starts):
+            raise ValueError(f"Rows are not grouped by {key}")
+
+        ends = np.append(starts[1:], len(keys))
+        return [
+            (keys[start], {column: self[column][start:end] for column in self.columns})
+            for start, end in zip(starts.tolist(), ends.tolist())
+        ]
+
+    def grid(self, x, y, value):
+        """
+        Arranges the values of a table laid out as a regular 2-D grid, with the rows
+        grouped by `y` and the same `x` values in the same order in every group, into
+        a 2-D array with a row for every `y`. The array is a view of the value column,
+        ready for the 2-D `ys` of the interpolation functions or `BicubicSpline`.
+
+        :param x: Name of the x column.
+        :param y: Name of the y column.
+        :param value: Name of the value column.
+        :return: A tuple of the x values, the y values and the 2-D array of values.
+        :raises ValueError: If the table is not laid out as a regular grid.
+        """
+        xs = self[x]
+        ys = self[y]
+
+        width = np.argmax(ys != ys[0]) if np.any(ys != ys[0]) else len(ys)
+        if len(ys) % width != 0:
+            raise ValueError("Rows don't form a regular grid")
+
+        shape = (len(ys) // width, width)
+        grid_xs = xs.reshape(shape)
+        grid_ys = ys.reshape(shape)
+        if np.any(grid_xs != grid_xs[0]) or np.any(grid_ys != grid_ys[:, :1]):
+            raise ValueError("Rows don't form a regular grid")
+
+        return grid_xs[0], grid_ys[:, 0], self[value].reshape(shape)
+
+def load(path, cache_dir=None, chunk_size=1000000):
+    """
+    Loads a whitespace-delimited data file with a header line, such as `data.txt`, through
+    a binary columnar cache.
+
+    The first time a file is loaded, its text is parsed chunk by chunk and every column is
+    written to the cache as raw float64 values, so that the memory needed for parsing stays
+    bounded by the chunk size. Later loads only memory-map the cache. The cache is rebuilt
+    whenever the size or the modification time of the file changes.
+
+    :param path: Path of the data file.
+    :param cache_dir: Directory of the cache. Defaults to the path of the file with a
+        `.cache` suffix.
+    :param chunk_size: Number of lines parsed at once. Default is 1000000.
+    :return: A `Table` with the columns of the file.
+    :rtype: Table
+    """
+    if cache_dir is None:
+        cache_dir = f"{path}.cache"
+
+    status = os.stat(path)
+    source = {"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    try:
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        manifest = None
+
+    if manifest is None or manifest.get("version") != _CACHE_VERSION or manifest.get("source") != source:
+        manifest = _build_cache(path, cache_dir, source, chunk_size)
+
+    return Table(cache_dir, manifest)
+
+def _build_cache(path, cache_dir, source, chunk_size):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    rows = 0
+    with open(path) as text:
+        columns = text.readline().split()
+        outputs = [open(os.path.join(cache_dir, f"{index}.f8"), "wb") for index in range(len(columns))]
+        try:
+            while True:
+                lines = list(itertools.islice(text, chunk_size))
+                if not lines:
+                    break
+
+                chunk = np.loadtxt(lines, dtype="<f8", ndmin=2)
+                if chunk.size == 0:
+                    continue
+                if chunk.shape[1] != len(columns):
+                    raise ValueError("A different number of values and columns were given")
+
+                for index, output in enumerate(outputs):
+                    output.write(np.ascontiguousarray(chunk[:, index]).tobytes())
+                rows += len(chunk)
+        finally:
+            for output in outputs:
+                output.close()
+
+    manifest = {"version": _CACHE_VERSION, "source": source, "columns": columns, "rows": rows}
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file)
+
+    return manifest
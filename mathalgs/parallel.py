@@ -0,0 +1,172 @@
+import concurrent.futures
+import os
+from multiprocessing import shared_memory
+from multiprocessing import util
+import numpy as np
+
+def series(function, xs, ys, *arguments, workers=None, chunk_size=16, backend="process", **keywords):
+    """
+    Computes `function(xs, ys, *arguments, **keywords)` for a 2-D `ys` with one series per
+    row, such as the `f(x,y)` values of every `y` slice of a dataset, by splitting the rows
+    into chunks processed in parallel.
+
+    Any function of mathalgs which accepts a 2-D `ys`, for example `interpolate.spline`,
+    `approximate.polynomial` or `differentiation.differentiate`, can be used. The chunks
+    are the same for any number of workers and every chunk is computed exactly as it would
+    be serially, so the result is identical to the one with `workers=1`, which computes
+    the chunks one after another in the calling thread.
+
+    With the process backend, `xs`, `ys` and the result are passed through shared memory,
+    so only the function and the remaining arguments are pickled, once per worker.
+
+    :param function: Function computing the result for a chunk of rows, returning an array
+        with a leading axis of one entry per row. With the process backend it has to be
+        picklable, such as a module-level function.
+    :param xs: List or array of x-coordinates shared by all series.
+    :param ys: 2-D array with one series of y-coordinates per row.
+    :param arguments: Further positional arguments of the function.
+    :param workers: Number of workers. Defaults to the number of CPUs.
+    :param chunk_size: Number of rows computed at once. Default is 16.
+    :param backend: "process" (default) for a process pool or "thread" for a thread pool.
+    :param keywords: Further keyword arguments of the function.
+    :return: Array with the results of all rows, in order.
+    :raises ValueError: If `ys` is not a 2-D array.
+    :raises ValueError: If the backend is neither "process" nor "thread".
+    """
+    ys = np.asarray(ys, dtype=float)
+    if ys.ndim != 2:
+        raise ValueError("Series have to be given as a 2-D array")
+
+    xs = np.asarray(xs, dtype=float)
+    return _run(function, [xs, ys], 1, 0, arguments, keywords, workers, chunk_size, backend)
+
+def evaluate(interpolant, interpolating_xs, workers=None, chunk_size=65536, backend="thread"):
+    """
+    Evaluates a fitted object, such as a `SplineInterpolant` or a `PolynomialFit`, at a
+    large number of x-coordinates by splitting them into chunks evaluated in parallel.
+
+    Every x-coordinate is evaluated independently of the others, so the result is identical
+    to `interpolant(interpolating_xs)`. The thread backend suits the NumPy-heavy evaluation
+    of all mathalgs interpolants, which releases the GIL. With the process backend, the
+    x-coordinates and the result are passed through shared memory, and the interpolant
+    is pickled once per worker.
+
+    :param interpolant: Fitted object or function evaluating an array of x-coordinates.
+    :param interpolating_xs: List or array of x-coordinates to evaluate.
+    :param workers: Number of workers. Defaults to the number of CPUs.
+    :param chunk_size: Number of x-coordinates evaluated at once. Default is 65536.
+    :param backend: "thread" (default) for a thread pool or "process" for a process pool.
+    :return: Array of values at `interpolating_xs`, with a leading series axis when the
+        interpolant was fitted to several series.
+    :raises ValueError: If the backend is neither "process" nor "thread".
+    """
+    interpolating_xs = np.asarray(interpolating_xs, dtype=float)
+    points = interpolating_xs.ravel()
+
+    values = _run(interpolant, [points], 0, -1, (), dict(), workers, chunk_size, backend)
+    return values.reshape(values.shape[:-1] + interpolating_xs.shape)
+
+def _chunk(arrays, sliced, start, end):
+    arrays = list(arrays)
+    arrays[sliced] = arrays[sliced][start:end]
+    return arrays
+
+def _place(output, axis, start, end, values):
+    if axis == 0:
+        output[start:end] = values
+    else:
+        output[..., start:end] = values
+
+def _run(function, arrays, sliced, axis, arguments, keywords, workers, chunk_size, backend):
+    if backend not in ("process", "thread"):
+        raise ValueError("Backend has to be either process or thread")
+
+    length = len(arrays[sliced])
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # The first chunk is computed in the calling thread to learn the shape of the output.
+    first = np.asarray(function(*_chunk(arrays, sliced, 0, chunk_size), *arguments, **keywords))
+    shape = list(first.shape)
+    shape[axis] = length
+    bounds = [(start, min(start + chunk_size, length)) for start in range(chunk_size, length, chunk_size)]
+
+    if workers <= 1 or not bounds:
+        output = np.empty(shape, dtype=first.dtype)
+        _place(output, axis, 0, min(chunk_size, length), first)
+        for start, end in bounds:
+            _place(output, axis, start, end, function(*_chunk(arrays, sliced, start, end), *arguments, **keywords))
+        return output
+
+    if backend == "thread":
+        output = np.empty(shape, dtype=first.dtype)
+        _place(output, axis, 0, min(chunk_size, length), first)
+
+        def work(start, end):
+            _place(output, axis, start, end, function(*_chunk(arrays, sliced, start, end), *arguments, **keywords))
+
+        with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+            for future in [executor.submit(work, start, end) for start, end in bounds]:
+                future.result()
+        return output
+
+    blocks = []
+    output = None
+    try:
+        specs = []
+        for array in arrays:
+            specs.append(_share(blocks, array.shape, array.dtype))
+            np.ndarray(array.shape, array.dtype, buffer=blocks[-1].buf)[...] = array
+
+        specs.append(_share(blocks, tuple(shape), first.dtype))
+        output = np.ndarray(shape, first.dtype, buffer=blocks[-1].buf)
+        _place(output, axis, 0, min(chunk_size, length), first)
+
+        initargs = (function, arguments, keywords, specs, sliced, axis)
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=_attach, initargs=initargs) as executor:
+            for future in [executor.submit(_work, start, end) for start, end in bounds]:
+                future.result()
+
+        return output.copy()
+    finally:
+        # Views of the shared memory have to be released before it can be closed.
+        output = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def _share(blocks, shape, dtype):
+    block = shared_memory.SharedMemory(create=True, size=max(dtype.itemsize * int(np.prod(shape)), 1))
+    blocks.append(block)
+    return block.name, shape, dtype.str
+
+_worker = None
+
+def _attach(function, arguments, keywords, specs, sliced, axis):
+    global _worker
+
+    blocks = []
+    arrays = []
+    for name, shape, dtype in specs:
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype, buffer=block.buf))
+
+    _worker = {"function": function, "arguments": arguments, "keywords": keywords, "blocks": blocks,
+               "arrays": arrays[:-1], "output": arrays[-1], "sliced": sliced, "axis": axis}
+
+    # Workers exit without running atexit hooks, but the finalizers of multiprocessing are run.
+    util.Finalize(None, _detach, args=(blocks,), exitpriority=0)
+
+def _detach(blocks):
+    global _worker
+
+    # Views of the shared memory have to be released before it can be closed.
+    _worker = None
+    for block in blocks:
+        block.close()
+
+def _work(start, end):
+    arrays = _chunk(_worker["arrays"], _worker["sliced"], start, end)
+    values = _worker["function"](*arrays, *_worker["arguments"], **_worker["keywords"])
+    _place(_worker["output"], _worker["axis"], start, end, values)
\ No newline at end of file
@@ -0,0 +1,253 @@
+import atexit
+import contextlib
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+import mathalgs
+from mathalgs import approximate
+from mathalgs import differentiation
+from mathalgs import grid
+from mathalgs import integrate
+from mathalgs import interpolate
+from mathalgs import loader
+from mathalgs import sampling
+from mathalgs import statistics
+
+_MODULES = [statistics, grid, interpolate, approximate, integrate, differentiation, sampling, loader]
+_PHASES = {"__init__": "fit", "__call__": "evaluate"}
+
+class Profile:
+    """
+    Aggregated measurements of the instrumented mathalgs calls.
+
+    For every instrumented function or method, the profile counts its calls and sums
+    their wall time and input sizes. The input size of a call is the largest number of
+    elements among its array or sequence arguments. The time of a call includes the time
+    of the instrumented calls made by it, such as the fit made by `interpolate.spline`,
+    while its self time excludes them, so that the self times of all calls add up to the
+    time spent in mathalgs.
+
+    Hooks, callables appended to `hooks`, are called after every instrumented call with
+    the name of the call, its phase ("fit", "evaluate" or "call"), its wall time in
+    seconds and its input size, for example to forward them to a metrics system.
+    """
+
+    def __init__(self):
+        self.entries = dict()
+        self.hooks = []
+        self._phases = dict()
+        self._lock = threading.Lock()
+
+    def record(self, name, phase, seconds, size, own_seconds=None, own_phase=None):
+        """
+        Adds the measurement of one call to the profile and passes it to the hooks.
+
+        :param name: Name of the called function or method.
+        :param phase: Phase of the call, "fit", "evaluate" or "call".
+        :param seconds: Wall time of the call.
+        :param size: Input size of the call.
+        :param own_seconds: Self time of the call, without the instrumented calls made by
+            it. Equal to `seconds` by default.
+        :param own_phase: Phase the self time is counted in, the phase of the enclosing fit
+            or evaluation for a plain call made by one. Equal to `phase` by default.
+        """
+        own_seconds = seconds if own_seconds is None else own_seconds
+        own_phase = phase if own_phase is None else own_phase
+
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                entry = self.entries[name] = {"phase": phase, "calls": 0, "time": 0.0, "self": 0.0, "size": 0, "max_size": 0}
+
+            entry["calls"] += 1
+            entry["time"] += seconds
+            entry["self"] += own_seconds
+            self._phases[own_phase] = self._phases.get(own_phase, 0.0) + own_seconds
+            entry["size"] += size
+            entry["max_size"] = max(entry["max_size"], size)
+
+        for hook in self.hooks:
+            hook(name, phase, seconds, size)
+
+    def phases(self):
+        """
+        Sums the self time of all calls per phase, which shows the split between fitting
+        and evaluation. Every moment is counted once, in the phase of the innermost
+        instrumented call running at that moment, so the fit made inside
+        `interpolate.spline` counts as fit and not again as the call of `spline`. Plain
+        calls made by a fit or an evaluation, such as `grid.spacing`, count in its phase.
+
+        :return: A dictionary mapping every phase to its total time in seconds.
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._phases)
+
+    def report(self):
+        """
+        Formats the profile as a table sorted by total time, followed by the time per phase.
+
+        :return: The report as text.
+        :rtype: str
+        """
+        lines = [f"{'name':48} {'phase':8} {'calls':>8} {'total [ms]':>12} {'self [ms]':>12} {'mean [ms]':>12} {'mean size':>12} {'max size':>12}"]
+        for name, entry in sorted(self.entries.items(), key=lambda item: -item[1]["time"]):
+            lines.append(
+                f"{name:48} {entry['phase']:8} {entry['calls']:8} {entry['time'] * 1000:12.3f} {entry['self'] * 1000:12.3f} "
+                f"{entry['time'] * 1000 / entry['calls']:12.3f} {entry['size'] / entry['calls']:12.0f} {entry['max_size']:12}"
+            )
+        for phase, seconds in sorted(self.phases().items()):
+            lines.append(f"{phase} time: {seconds * 1000:.3f} ms")
+
+        return "\n".join(lines)
+
+    def reset(self):
+        """
+        Removes all measurements from the profile.
+        """
+        with self._lock:
+            self.entries = dict()
+            self._phases = dict()
+
+_profile = None
+_originals = []
+_calls = threading.local()
+
+def enable(profile=None):
+    """
+    Instruments all public functions and classes of mathalgs, recording their calls into
+    a profile. Constructing a fitted object, such as `NewtonInterpolant`, is recorded as
+    its fit and calling it as its evaluation. While profiling is disabled, the original
+    functions are in place, so the instrumentation costs nothing. Profiling can also be
+    enabled for the whole process by setting the `MATHALGS_PROFILE` environment variable,
+    in which case the report is printed to the standard error output at exit. The values
+    "", "0", "false" and "no" (in any case) leave profiling disabled.
+
+    :param profile: The profile to record into. A new profile by default, or the current
+        one when profiling is already enabled.
+    :return: The profile being recorded into.
+    :rtype: Profile
+    """
+    global _profile
+
+    if _profile is None:
+        _instrument()
+    if profile is not None or _profile is None:
+        _profile = profile or Profile()
+
+    return _profile
+
+def disable():
+    """
+    Restores the original functions and classes of mathalgs and stops recording.
+
+    :return: The profile recorded into, or None if profiling wasn't enabled.
+    :rtype: Profile
+    """
+    global _profile
+
+    for owner, name, original in reversed(_originals):
+        setattr(owner, name, original)
+    _originals.clear()
+
+    profile, _profile = _profile, None
+    return profile
+
+def current():
+    """
+    :return: The profile being recorded into, or None if profiling is disabled.
+    :rtype: Profile
+    """
+    return _profile
+
+@contextlib.contextmanager
+def profile():
+    """
+    Enables profiling for the duration of a `with` block and restores the previous state
+    afterwards.
+
+    :return: A context manager yielding the profile being recorded into.
+    """
+    was_enabled = _profile is not None
+    recorded = enable()
+    try:
+        yield recorded
+    finally:
+        if not was_enabled:
+            disable()
+
+def _size(argument):
+    size = getattr(argument, "size", None)
+    if isinstance(size, int):
+        return size
+    if isinstance(argument, (list, tuple)):
+        return len(argument)
+    return 0
+
+def _wrap(function, name, phase):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # Every running instrumented call of the thread sums the time of the calls made by
+        # it, and plain calls inherit the phase of the fit or evaluation they are made by.
+        if not hasattr(_calls, "nested"):
+            _calls.nested = []
+        enclosing = _calls.nested[-1][1] if _calls.nested else "call"
+        own_phase = enclosing if phase == "call" else phase
+        _calls.nested.append([0.0, own_phase])
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            own_seconds = seconds - _calls.nested.pop()[0]
+            if _calls.nested:
+                _calls.nested[-1][0] += seconds
+
+            size = max([_size(argument) for argument in args + tuple(kwargs.values())], default=0)
+            if _profile is not None:
+                _profile.record(name, phase, seconds, size, own_seconds, own_phase)
+
+    return wrapper
+
+def _replace(owner, name, replacement):
+    _originals.append((owner, name, getattr(owner, name)))
+    setattr(owner, name, replacement)
+
+def _instrument():
+    wrappers = dict()
+
+    for module in _MODULES:
+        prefix = module.__name__.rsplit(".", 1)[-1]
+        for name, member in list(vars(module).items()):
+            if getattr(member, "__module__", None) != module.__name__:
+                continue
+
+            if inspect.isfunction(member) and (not name.startswith("_") or name in _PHASES):
+                wrappers[member] = _wrap(member, f"{prefix}.{name}", _PHASES.get(name, "call"))
+                _replace(module, name, wrappers[member])
+            elif inspect.isclass(member) and not name.startswith("_"):
+                fitted = "__call__" in vars(member)
+                for method_name, method in list(vars(member).items()):
+                    if not inspect.isfunction(method) or (method_name.startswith("_") and method_name not in _PHASES):
+                        continue
+                    if method_name == "__init__" and not fitted:
+                        continue
+                    phase = _PHASES.get(method_name, "call")
+                    label = phase if method_name in _PHASES else method_name
+                    _replace(member, method_name, _wrap(method, f"{prefix}.{name}.{label}", phase))
+
+    for name, member in list(vars(mathalgs).items()):
+        if inspect.isfunction(member) and member in wrappers:
+            _replace(mathalgs, name, wrappers[member])
+
+def _report_at_exit():
+    if _profile is not None:
+        print(_profile.report(), file=sys.stderr)
+
+if os.environ.get("MATHALGS_PROFILE", "").strip().lower() not in ("", "0", "false", "no"):
+    enable()
+    atexit.register(_report_at_exit)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import numpy as np
+
+_QUARTERS = np.array([0.25, 0.75])
+_CHECKED = np.array([0.25, 0.5, 0.75])
+
+def adaptive(function, start, end, tolerance=1e-3, initial=16, max_depth=12):
+    """
+    Samples a fitted interpolant or approximation over the interval [start, end] with as
+    few points as possible, for plotting or transfer. The interval is divided into
+    `initial` equal parts, and every part whose center or quarter points differ from the
+    linear interpolation of its ends by more than the tolerance is bisected, until all
+    parts are straight enough or `max_depth` bisections were made. The quarter points of a
+    bisected part are the centers of its halves, so every round evaluates only the two
+    quarter points of each part. Only the ends of the parts are returned, so nearly
+    straight stretches of the curve are covered by a few points.
+
+    A fit of several series, such as a `SplineInterpolant` of a 2-D `ys`, is sampled for
+    all of them at once: the parts of every series are bisected independently, and the
+    quarter points of all of them are evaluated together in a single call of the function
+    per round. As all series start from the same parts, their quarter points lie on the
+    same grid and are evaluated only once.
+
+    :param function: A callable evaluating the curve for an array of x-values, such as a
+        fitted interpolant, returning an array with a leading series axis for several series.
+    :param start: Start of the sampled interval.
+    :param end: End of the sampled interval.
+    :param tolerance: Absolute error of the linear interpolation of the samples at which
+        the refinement stops. Default is 1e-3.
+    :param initial: Number of parts of the initial division, which has to resolve every
+        feature of the curve narrower than the refinement can find. Default is 16.
+    :param max_depth: Maximum number of bisections of an initial part. Default is 12.
+    :return: A tuple of the x-values and the y-values of the samples in ascending order of
+        x, or, when several series were fitted, a tuple of the series indices, x-values
+        and y-values ordered by series and x.
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    :raises ValueError: If the initial division has no parts.
+    """
+    if initial < 1:
+        raise ValueError("At least one part of the initial division is required")
+
+    xs = np.linspace(start, end, 2 * initial + 1)
+    values = np.asarray(function(xs))
+    single = values.ndim == 1
+    values = values.reshape(-1, len(xs))
+    count = len(values)
+
+    points = [(np.repeat(np.arange(count), initial + 1), np.tile(xs[::2], count), values[:, ::2].ravel())]
+
+    # Every part is given by its series and the x and y values of its ends and its center.
+    parts = np.repeat(np.arange(count), initial)
+    lefts, rights = np.tile(xs[:-2:2], count), np.tile(xs[2::2], count)
+    left_values, right_values = values[:, :-2:2].ravel(), values[:, 2::2].ravel()
+    centers, center_values = np.tile(xs[1::2], count), values[:, 1::2].ravel()
+
+    for _ in range(max_depth):
+        quarters = lefts[:, None] + (rights - lefts)[:, None] * _QUARTERS
+        unique, indices = np.unique(quarters, return_inverse=True)
+        quarter_values = np.asarray(function(unique)).reshape(-1, len(unique))[parts[:, None], indices.reshape(quarters.shape)]
+
+        checked = np.column_stack((quarter_values[:, 0], center_values, quarter_values[:, 1]))
+        linear = left_values[:, None] + (right_values - left_values)[:, None] * _CHECKED
+        refined = np.any(np.abs(checked - linear) > tolerance, axis=-1)
+        if not np.any(refined):
+            break
+
+        # A refined part keeps its center and is bisected, the quarters becoming the centers of the halves.
+        parts, lefts, rights = parts[refined], lefts[refined], rights[refined]
+        left_values, right_values = left_values[refined], right_values[refined]
+        points.append((parts, centers[refined], center_values[refined]))
+
+        parts = np.repeat(parts, 2)
+        lefts, rights = np.column_stack((lefts, centers[refined])).ravel(), np.column_stack((centers[refined], rights)).ravel()
+        left_values = np.column_stack((left_values, center_values[refined])).ravel()
+        right_values = np.column_stack((center_values[refined], right_values)).ravel()
+        centers, center_values = quarters[refined].ravel(), quarter_values[refined].ravel()
+
+    series, xs, ys = (np.concatenate(arrays) for arrays in zip(*points))
+    order = np.lexsort((xs, series))
+    series, xs, ys = series[order], xs[order], ys[order]
+
+    return (xs, ys) if single else (series, xs, ys)
\ No newline at end of file
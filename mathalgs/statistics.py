@@ -1,3 +1,6 @@
+import numpy as np
+import mathalgs.buffers as bf
+
 def average(sequence):
     """
     Calculates the average of a given sequence of numbers.
@@ -22,20 +25,63 @@ def median(sequence):
     as the average of the two middle numbers. If it has an odd number of elements,
     the median is the middle value in the sorted sequence.
 
+    The middle values are found by selection (introselect) instead of sorting, which
+    takes O(n) time and works directly on NumPy buffers.
+
     :param sequence: A sequence of numeric values for which the median needs to
         be calculated.
-    :type sequence: list[float] | list[int]
+    :type sequence: list[float] | list[int] | numpy.ndarray
     :return: The median value of the sequence if it is non-empty.
     :rtype: float | int
     """
     length = len(sequence)
     if length == 0: raise ValueError("Sequence has to be not empty.")
 
-    sequence = sorted(sequence)
+    middle = length // 2
     if (length % 2) == 0:
-        return average(sequence[length // 2 - 1:length // 2 + 1])
+        sequence = np.partition(sequence, (middle - 1, middle))
+        return average(sequence[middle - 1:middle + 1])
     else:
-        return sequence[length // 2]
+        return np.partition(sequence, middle)[middle]
+
+def quantiles(sequence, qs, out=None, dtype=float):
+    """
+    Calculates many quantiles of a given sequence of numbers at once.
+
+    A quantile lying between two elements of the sorted sequence is linearly
+    interpolated between them, so the quantile 0.5 equals the median. All elements
+    needed by all quantiles are found in a single selection pass over the data,
+    which takes O(n) time per distinct element instead of sorting the sequence.
+
+    :param sequence: A sequence of numeric values.
+    :type sequence: list[float] | list[int] | numpy.ndarray
+    :param qs: A number or a sequence of numbers between 0 and 1.
+    :type qs: float | list[float] | numpy.ndarray
+    :param out: Array to store the quantiles in, of the shape of `qs`.
+    :type out: numpy.ndarray, optional
+    :param dtype: Floating-point type of the computation, float64 by default.
+    :type dtype: numpy.dtype, optional
+    :return: Array of quantiles, in the shape of `qs`.
+    :rtype: numpy.ndarray
+    """
+    length = len(sequence)
+    if length == 0: raise ValueError("Sequence has to be not empty.")
+
+    dtype = bf.floating(dtype)
+    qs = np.asarray(qs, dtype=dtype)
+    if np.any((qs < 0) | (qs > 1)): raise ValueError("Quantiles have to be between 0 and 1.")
+
+    positions = qs * (length - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, length - 1)
+
+    sequence = np.partition(np.asarray(sequence, dtype=dtype), np.unique(np.concatenate((lower.ravel(), upper.ravel()))))
+
+    result = bf.output(out, qs.shape, dtype)
+    np.multiply(positions - lower, sequence[upper] - sequence[lower], out=result)
+    result += sequence[lower]
+
+    return result[()] if out is None and result.ndim == 0 else result
 
 def deviation(sequence):
     """
@@ -55,4 +101,294 @@ def deviation(sequence):
     if length == 0: raise ValueError("Sequence has to be not empty.")
     if length == 1: return 0
 
-    return (sum((i - avg) ** 2 for i in sequence) / length) ** 0.5
\ No newline at end of file
+    return (sum((i - avg) ** 2 for i in sequence) / length) ** 0.5
+
+def grouped_average(keys, values, out=None, dtype=float):
+    """
+    Calculates the average of the values in every group of a long-format table.
+
+    :param keys: A sequence of group keys, one per value.
+    :param values: A sequence of numeric values of the same length as `keys`.
+    :param out: Array to store the averages in, with one entry per group.
+    :param dtype: Floating-point type of the values, float64 by default.
+    :return: A tuple of the sorted unique keys and an array of their averages.
+    """
+    groups, inverse, counts, values = _group(keys, values, dtype)
+
+    return groups, _grouped_average(inverse, counts, values, out)
+
+def grouped_median(keys, values, out=None, dtype=float):
+    """
+    Calculates the median of the values in every group of a long-format table,
+    defined the same way as in `median`.
+
+    :param keys: A sequence of group keys, one per value.
+    :param values: A sequence of numeric values of the same length as `keys`.
+    :param out: Array to store the medians in, with one entry per group.
+    :param dtype: Floating-point type of the values, float64 by default.
+    :return: A tuple of the sorted unique keys and an array of their medians.
+    """
+    groups, inverse, counts, values = _group(keys, values, dtype)
+
+    return groups, _grouped_median(inverse, counts, values, out)
+
+def grouped_deviation(keys, values, out=None, dtype=float):
+    """
+    Calculates the standard deviation of the values in every group of a long-format
+    table, defined the same way as in `deviation`.
+
+    :param keys: A sequence of group keys, one per value.
+    :param values: A sequence of numeric values of the same length as `keys`.
+    :param out: Array to store the standard deviations in, with one entry per group.
+    :param dtype: Floating-point type of the values, float64 by default.
+    :return: A tuple of the sorted unique keys and an array of their standard deviations.
+    """
+    groups, inverse, counts, values = _group(keys, values, dtype)
+
+    return groups, _grouped_deviation(inverse, counts, values, _grouped_average(inverse, counts, values), out)
+
+def describe_by(keys, values):
+    """
+    Calculates the average, the median and the standard deviation of the values in
+    every group of a long-format table, such as the `f(x,y)` values per `y`.
+
+    The keys are sorted once and every statistic is then computed for all groups at
+    once with segmented vectorized reductions, without a Python call per group.
+
+    :param keys: A sequence of group keys, one per value.
+    :param values: A sequence of numeric values of the same length as `keys`.
+    :return: A dictionary containing four keys: "groups" with the sorted unique keys,
+        and "average", "median" and "deviation", each mapping to an array with the
+        statistic of every group.
+    :rtype: dict
+    """
+    groups, inverse, counts, values = _group(keys, values)
+
+    result = dict()
+    result["groups"] = groups
+    result["average"] = _grouped_average(inverse, counts, values)
+    result["median"] = _grouped_median(inverse, counts, values)
+    result["deviation"] = _grouped_deviation(inverse, counts, values, result["average"])
+
+    return result
+
+def _group(keys, values, dtype=float):
+    if len(keys) != len(values):
+        raise ValueError("A different number of keys and values were given")
+    if len(keys) == 0: raise ValueError("Sequence has to be not empty.")
+
+    groups, inverse, counts = np.unique(np.asarray(keys), return_inverse=True, return_counts=True)
+
+    return groups, inverse.ravel(), counts, np.asarray(values, dtype=bf.floating(dtype))
+
+def _grouped_average(inverse, counts, values, out=None):
+    result = bf.output(out, counts.shape, values.dtype)
+    return np.divide(np.bincount(inverse, weights=values), counts, out=result)
+
+def _grouped_median(inverse, counts, values, out=None):
+    ordered = values[np.lexsort((values, inverse))]
+    starts = np.cumsum(counts) - counts
+
+    result = bf.output(out, counts.shape, values.dtype)
+    np.add(ordered[starts + (counts - 1) // 2], ordered[starts + counts // 2], out=result)
+    result /= 2
+
+    return result
+
+def _grouped_deviation(inverse, counts, values, averages, out=None):
+    result = bf.output(out, counts.shape, values.dtype)
+    np.divide(np.bincount(inverse, weights=(values - averages[inverse]) ** 2), counts, out=result)
+
+    return np.sqrt(result, out=result)
+
+class RunningStatistics:
+    """
+    Accumulates the average and the standard deviation of a stream of numbers in a
+    single pass, without keeping the numbers in memory.
+
+    Every chunk passed to `update` is reduced with vectorized operations and combined
+    with the running state using Welford's (Chan's parallel) update, which stays
+    numerically stable for long streams. Accumulators built over separate parts of the
+    data, for example in worker processes, can be combined with `merge`.
+
+    The standard deviation is computed the same way as in `deviation`.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._average = 0.0
+        self._squares = 0.0
+
+    def update(self, chunk):
+        """
+        Adds a chunk of numbers to the accumulator.
+
+        :param chunk: A sequence or array of numeric values.
+        :return: The accumulator itself, to allow chaining.
+        """
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if len(chunk) == 0:
+            return self
+
+        chunk_average = np.mean(chunk)
+        chunk_squares = np.sum((chunk - chunk_average) ** 2)
+
+        return self._combine(len(chunk), chunk_average, chunk_squares)
+
+    def merge(self, other):
+        """
+        Combines the state of another accumulator into this one. The result is the same
+        as if all numbers had been passed to a single accumulator.
+
+        :param other: Another `RunningStatistics` instance.
+        :return: The accumulator itself, to allow chaining.
+        """
+        if other.count == 0:
+            return self
+
+        return self._combine(other.count, other._average, other._squares)
+
+    def _combine(self, count, average, squares):
+        total = self.count + count
+        delta = average - self._average
+
+        self._average += delta * count / total
+        self._squares += squares + delta ** 2 * self.count * count / total
+        self.count = total
+
+        return self
+
+    @property
+    def average(self):
+        """
+        The average of all numbers seen so far.
+        """
+        if self.count == 0: raise ValueError("Sequence has to be not empty.")
+
+        return float(self._average)
+
+    @property
+    def variance(self):
+        """
+        The variance of all numbers seen so far, the square of `deviation`.
+        """
+        if self.count == 0: raise ValueError("Sequence has to be not empty.")
+
+        return float(self._squares / self.count)
+
+    @property
+    def deviation(self):
+        """
+        The standard deviation of all numbers seen so far.
+        """
+        return self.variance ** 0.5
+
+class TDigest:
+    """
+    Approximates quantiles of a stream of numbers in a single pass with bounded memory.
+
+    The numbers are summarized by weighted centroids, which are small near both tails of
+    the distribution and large around the median, so the error of the rank of a quantile
+    shrinks towards the extreme quantiles. In a sparse tail, such as that of heavy-tailed
+    data, a small rank error can still be a large error of the value; a larger
+    `compression` reduces both.
+
+    Once the number of centroids exceeds `compression`, adjacent centroids are merged as
+    long as the merged centroid spans at most one unit of the arcsine scale function
+    `k(q) = compression / (2 * pi) * arcsin(2 * q - 1)` of the t-digest, which keeps
+    between `compression / 2` and `compression` of them. The quantiles are interpolated
+    between the centroids the same way as in `quantiles`, so as long as no more numbers
+    than `compression` have been seen, they are equal to those of `quantiles`. Digests
+    built over separate parts of the data can be combined with `merge`.
+
+    :param compression: Controls the accuracy and the memory of the digest. Default is 100.
+    """
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.count = 0
+        self._means = np.zeros(0)
+        self._weights = np.zeros(0)
+        self._minimum = np.inf
+        self._maximum = -np.inf
+
+    def update(self, chunk):
+        """
+        Adds a chunk of numbers to the digest.
+
+        :param chunk: A sequence or array of numeric values.
+        :return: The digest itself, to allow chaining.
+        """
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        if len(chunk) == 0:
+            return self
+
+        return self._combine(chunk, np.ones(len(chunk)), np.min(chunk), np.max(chunk))
+
+    def merge(self, other):
+        """
+        Combines the centroids of another digest into this one.
+
+        :param other: Another `TDigest` instance.
+        :return: The digest itself, to allow chaining.
+        """
+        if other.count == 0:
+            return self
+
+        return self._combine(other._means, other._weights, other._minimum, other._maximum)
+
+    def _combine(self, means, weights, minimum, maximum):
+        means = np.concatenate((self._means, means))
+        weights = np.concatenate((self._weights, weights))
+
+        order = np.argsort(means, kind="stable")
+        self._means = means[order]
+        self._weights = weights[order]
+        self._minimum = min(self._minimum, minimum)
+        self._maximum = max(self._maximum, maximum)
+        self.count = np.sum(self._weights)
+
+        if len(self._means) > self.compression:
+            self._compress()
+
+        return self
+
+    def _compress(self):
+        cumulative = np.cumsum(self._weights)
+        quarter = self.compression / 4
+
+        # Every merged centroid is extended to the last centroid that keeps it within one unit of the scale.
+        starts = []
+        start = 0
+        while start < len(cumulative):
+            starts.append(start)
+            left = cumulative[start - 1] if start > 0 else 0.0
+            scale = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * left / self.count - 1, -1, 1))
+            limit = (np.sin(2 * np.pi * min(scale + 1, quarter) / self.compression) + 1) / 2 * self.count
+            start = max(int(np.searchsorted(cumulative, limit, side="right")), start + 1)
+
+        weights = np.add.reduceat(self._weights, starts)
+        self._means = np.add.reduceat(self._means * self._weights, starts) / weights
+        self._weights = weights
+
+    def quantile(self, q):
+        """
+        Estimates the quantile (or quantiles) of all numbers seen so far.
+
+        :param q: A number or an array of numbers between 0 and 1.
+        :return: The estimated quantile for every value of `q`.
+        """
+        if self.count == 0: raise ValueError("Sequence has to be not empty.")
+
+        # A centroid stands for the numbers at its ranks in the sorted sequence, and sits at their middle.
+        positions = np.concatenate(([0], np.cumsum(self._weights) - (self._weights + 1) / 2, [self.count - 1]))
+        values = np.concatenate(([self._minimum], self._means, [self._maximum]))
+
+        return np.interp(np.asarray(q, dtype=float) * (self.count - 1), positions, values)
+
+    @property
+    def median(self):
+        """
+        The estimated median of all numbers seen so far.
+        """
+        return float(self.quantile(0.5))
\ No newline at end of file
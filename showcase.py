@@ -10,8 +10,9 @@ import numpy as np
 
 
 
-# Load data from space-separated text file into pandas DataFrame
-df = pd.read_csv("data.txt", delimiter=r'\s+')
+# Load data from space-separated text file through its binary cache into pandas DataFrame
+table = ma.loader.load("data.txt")
+df = pd.DataFrame({column: table[column] for column in table.columns})
 
 
 
@@ -35,19 +36,12 @@ plt.show()
 plt.figure("Statistical calculations of F(x,y)")
 plt.title("Statistical calculations of F(x,y)")
 
-# Get unique y values
-ys = df['y'].unique()
-
-# Initialize lists for statistical measures
-averages = []
-medians = []
-deviations = []
-
-# Calculate statistics for each y value
-for _, subdf in df.groupby('y'):
-    averages.append(ma.statistics.average(subdf['f(x,y)']))
-    medians.append(ma.statistics.median(subdf['f(x,y)']))
-    deviations.append(ma.statistics.deviation(subdf['f(x,y)']))
+# Calculate statistics for each y value at once
+statistics = ma.statistics.describe_by(df['y'], df['f(x,y)'])
+ys = statistics['groups']
+averages = statistics['average']
+medians = statistics['median']
+deviations = statistics['deviation']
 
 # Create a grouped bar chart for statistical measures
 plt.bar(ys - 0.35, averages, 0.35, color="green", label="Average")
@@ -70,6 +64,9 @@ chosen_y = np.random.choice(df['y'].unique())
 # Get x and F(x,y) values for selected y
 xs = df[df['y'] == chosen_y]['x'].tolist()
 ys = df[df['y'] == chosen_y]['f(x,y)'].tolist()
+# Fit the interpolating polynomial and spline once and evaluate them wherever needed
+newton = ma.interpolate.NewtonInterpolant(xs, ys)
+cubic_spline = ma.interpolate.SplineInterpolant(xs, ys)
 
 
 
@@ -79,7 +76,7 @@ plt.title(f"Polynomial interpolation for y = {chosen_y}")
 
 # Generate points for a smooth interpolation curve
 interpolating_xs = np.linspace(min(xs), max(xs), 1000)
-interpolating_ys = ma.interpolate.polynomial(xs, ys, interpolating_xs)
+interpolating_ys = newton(interpolating_xs)
 
 # Plot both interpolated function and original points
 plt.plot(interpolating_xs, interpolating_ys, label="Interpolated function")
@@ -98,9 +95,8 @@ plt.show()
 plt.figure(f"Spline interpolation for y = {chosen_y}")
 plt.title(f"Spline interpolation for y = {chosen_y}")
 
-# Generate points for a smooth interpolation curve
-interpolating_xs = np.linspace(min(xs), max(xs), 1000)
-interpolating_ys = ma.interpolate.spline(xs, ys, interpolating_xs)
+# Sample the interpolation curve densely only where it bends
+interpolating_xs, interpolating_ys = ma.sampling.adaptive(cubic_spline, min(xs), max(xs), tolerance=0.001 * np.ptp(ys))
 
 # Plot both interpolated function and original points 
 plt.plot(interpolating_xs, interpolating_ys, label="Interpolated function")
@@ -123,8 +119,8 @@ plt.title(f"Comparison of spline and polynomial interpolation for y = {chosen_y}
 interpolating_xs = np.linspace(min(xs), max(xs), 1000)
 
 # Calculate interpolated y values using both methods
-interpolating_ys_polynomial = ma.interpolate.polynomial(xs, ys, interpolating_xs)
-interpolating_ys_spline = ma.interpolate.spline(xs, ys, interpolating_xs)
+interpolating_ys_polynomial = newton(interpolating_xs)
+interpolating_ys_spline = cubic_spline(interpolating_xs)
 
 # Plot interpolated curves and original points
 plt.plot(interpolating_xs, interpolating_ys_polynomial, label="Polynomial interpolation", linestyle="--")
@@ -147,25 +143,17 @@ plt.title(f"Comparison of approximated functions of different degrees for y = {c
 # Generate x values for approximation extending beyond original data points
 approximating_xs = np.linspace(min(xs) - 3, max(xs) + 3, 1400)
 
-# Calculate approximated y values using polynomials of degree 1 and 3
-approximating_ys_first = ma.approximate.polynomial(xs, ys, 1, approximating_xs)
-approximating_ys_third = ma.approximate.polynomial(xs, ys, 3, approximating_xs)
-
-# Calculate R-squared (coefficient of determination) for first-degree approximation
-approximating_ys_first_metrics = ma.approximate.polynomial(xs, ys, 1, xs)
-numerator = 0
-denominator = 0
-for i in range(len(ys)):
-    numerator += (ys[i] - approximating_ys_first_metrics[i]) ** 2
-    denominator += (ys[i] - ma.statistics.average(ys)) ** 2
-error_determination_coefficient = 1 - (numerator / denominator)
-
-# Calculate RMSE (Root Mean Square Error) for third-degree approximation
-approximating_ys_third_metrics = ma.approximate.polynomial(xs, ys, 3, xs)
-error_root_mean_square = 0
-for i in range(len(ys)):
-    error_root_mean_square += (ys[i] - approximating_ys_third_metrics[i]) ** 2
-error_root_mean_square = np.sqrt(error_root_mean_square / len(ys))
+# Fit polynomials of degree 3 and 1 from a single factorization and calculate approximated y values
+third_fit = ma.approximate.PolynomialFit(xs, ys, 3, basis="chebyshev")
+first_fit = third_fit.truncate(1)
+approximating_ys_first = first_fit(approximating_xs)
+approximating_ys_third = third_fit(approximating_xs)
+
+# R-squared (coefficient of determination) for first-degree approximation
+error_determination_coefficient = first_fit.r_squared
+
+# RMSE (Root Mean Square Error) for third-degree approximation
+error_root_mean_square = third_fit.rmse
 
 # Plot approximated functions and original data points
 plt.plot(approximating_xs, approximating_ys_first, label=f"Approximation with degree 1\nError(R^2): {round(error_determination_coefficient,2)}")
@@ -187,24 +175,28 @@ plt.title(f"Showing the impact of changing a step value while integrating for y
 
 # Calculate integral with low number of points (5)
 less_xs = np.linspace(min(xs), max(xs), 5)
-less_ys = ma.interpolate.polynomial(xs, ys, less_xs)
+less_ys = newton(less_xs)
 less_accuracy_integral = ma.integrate.trapezoidal(less_xs, less_ys)
 
 # Calculate integral with medium number of points (30) 
 medium_xs = np.linspace(min(xs), max(xs), 30)
-medium_ys = ma.interpolate.polynomial(xs, ys, medium_xs)
+medium_ys = newton(medium_xs)
 medium_accuracy_integral = ma.integrate.trapezoidal(medium_xs, medium_ys)
 
 # Calculate integral with high number of points (1000)
 high_xs = np.linspace(min(xs), max(xs), 1000)
-high_ys = ma.interpolate.polynomial(xs, ys, high_xs)
+high_ys = newton(high_xs)
 high_accuracy_integral = ma.integrate.trapezoidal(high_xs, high_ys)
 
+# Calculate integral of the interpolant adaptively up to a given tolerance
+adaptive_integral, adaptive_error = ma.integrate.gauss_kronrod(newton, min(xs), max(xs), tolerance=1e-6)
+
 # Plot the original function and filled areas representing different integration accuracies
 plt.plot(interpolating_xs, interpolating_ys_polynomial, linewidth=1, label="Original function")
 plt.fill_between(less_xs, less_ys, alpha=0.1, label=f"Integrate by 5 points: {round(less_accuracy_integral, 2)}")
 plt.fill_between(medium_xs, medium_ys, alpha=0.1, label=f"Integrate by 30 points: {round(medium_accuracy_integral, 2)}")
 plt.fill_between(high_xs, high_ys, alpha=0.1, label=f"Integrate by 1000 points: {round(high_accuracy_integral, 2)}")
+plt.plot([], [], ' ', label=f"Adaptive Gauss-Kronrod: {round(adaptive_integral, 2)} (error {adaptive_error:.1e})")
 
 # Set labels, add legend and grid
 plt.xlabel("x")
@@ -221,17 +213,17 @@ plt.title(f"Showing the impact of changing a step value while differentiate for
 
 # Calculate derivatives with low number of points (5)
 less_xs = np.linspace(min(xs), max(xs), 5)
-less_ys = ma.interpolate.spline(xs, ys, less_xs)
+less_ys = cubic_spline(less_xs)
 less_accuracy_derivatives = ma.differentiation.differentiate(less_xs, less_ys)
 
 # Calculate derivatives with medium number of points (30)
 medium_xs = np.linspace(min(xs), max(xs), 30)
-medium_ys = ma.interpolate.spline(xs, ys, medium_xs)
+medium_ys = cubic_spline(medium_xs)
 medium_accuracy_derivatives = ma.differentiation.differentiate(medium_xs, medium_ys)
 
 # Calculate derivatives with high number of points (1000)
 high_xs = np.linspace(min(xs), max(xs), 1000)
-high_ys = ma.interpolate.spline(xs, ys, high_xs)
+high_ys = cubic_spline(high_xs)
 high_accuracy_derivatives = ma.differentiation.differentiate(high_xs, high_ys)
 
 # Plot an original function and its derivative
@@ -289,9 +281,39 @@ for flat in monotonicity_derivatives['steady']:
     label = f"Steady F'(x,y): {format_segments(monotonicity_derivatives['steady'])}" if flat == monotonicity_derivatives['steady'][0] else ""
     plt.plot(monotonic_xs[flat[0]:flat[1]], high_accuracy_derivatives[flat[0]:flat[1]], color="blue", linestyle="-.", label=label)
 
+# Mark the exact turning points of the spline, found without sampling it
+turning_xs, maxima = cubic_spline.extrema()
+plt.scatter(turning_xs[maxima], cubic_spline(turning_xs[maxima]), color="black", marker="^", zorder=3, label="Maxima of the spline")
+plt.scatter(turning_xs[~maxima], cubic_spline(turning_xs[~maxima]), color="black", marker="v", zorder=3, label="Minima of the spline")
+
 # Add labels and display the plot
 plt.xlabel("x")
 plt.ylabel("F(x,y)")
 plt.legend()
 plt.grid()
+plt.show()
+
+
+# Create a tenth plot: Bicubic spline interpolation of the whole grid
+plt.figure("Bicubic spline interpolation of F(x,y)")
+plt.title("Bicubic spline interpolation of F(x,y)")
+
+# Arrange F(x,y) values into a grid with a row for every y
+grid_xs, grid_ys, grid_zs = table.grid('x', 'y', 'f(x,y)')
+surface = ma.interpolate.BicubicSpline(grid_xs, grid_ys, grid_zs)
+
+# Evaluate the surface on a dense mesh of points
+surface_xs, surface_ys = np.meshgrid(np.linspace(df['x'].min(), df['x'].max(), 300),
+                                     np.linspace(df['y'].min(), df['y'].max(), 300))
+surface_zs = surface(surface_xs, surface_ys)
+
+# Plot the interpolated surface and the original grid points
+plt.contourf(surface_xs, surface_ys, surface_zs, levels=30)
+plt.colorbar(label="F(x,y)")
+plt.plot(df['x'], df['y'], 'k.', label="Original points", markersize=2)
+
+# Add labels and display the plot
+plt.xlabel("x")
+plt.ylabel("y")
+plt.legend()
 plt.show()
\ No newline at end of file